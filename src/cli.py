@@ -1,41 +1,159 @@
 """Command line interface for the route table collector."""
-import json
+import io
+import itertools
+import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import click
+import orjson
 import structlog
+from cachetools import TTLCache, cached
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from sqlalchemy import and_, case, func, literal_column, select
+from sqlalchemy.orm import contains_eager, selectinload
 
 from .config import config
 from .database import db_manager
 from .models import Device, VRF, Route, CollectionRun, ChangeLog
-from .collector import RouteTableCollector
-from .scheduler import RouteTableScheduler
 
-console = Console()
+# highlight=False skips Rich's regex-based syntax highlighting on every
+# printed string, which is wasted CPU on row-heavy IP/number output;
+# markup stays on for our [bold ...] styles unless NO_COLOR asks for
+# full-speed plain rendering.
+console = Console(
+    highlight=False,
+    markup=not os.environ.get("NO_COLOR"),
+    emoji=False,
+    log_path=False
+)
 logger = structlog.get_logger(__name__)
 
 
+# Above this many rows, Rich's per-cell renderable normalization starts
+# to dominate wall-clock; the display commands fall back to plain text.
+_PLAIN_TABLE_THRESHOLD = 200
+
+# strftime reparses its format string on every call; bind the
+# equivalent str.format once and reuse it in the display loops.
+_FMT_MINUTE = "{:%Y-%m-%d %H:%M}".format
+_FMT_SECOND = "{:%Y-%m-%d %H:%M:%S}".format
+
+# (header, style) column templates, defined once so each command avoids
+# re-parsing the same add_column keyword options per invocation.
+_DEVICE_COLS = (("Hostname", "cyan"), ("IP Address", "blue"), ("Vendor", "green"),
+                ("Platform", "magenta"), ("Last Seen", "yellow"), ("Status", "red"))
+_ROUTE_COLS = (("Device", "cyan"), ("VRF", "blue"), ("Network", "green"),
+               ("Next Hop", "magenta"), ("Protocol", "yellow"), ("Metric", "red"))
+_CHANGE_COLS = (("Device", "cyan"), ("VRF", "blue"), ("Change Type", "green"),
+                ("Network", "magenta"), ("Detected", "yellow"))
+_METRIC_COLS = (("Metric", "cyan"), ("Value", "magenta"))
+
+
+def _build_table(title: str, columns) -> Table:
+    """Construct a Rich table from a column template."""
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
+
+def _print_plain_rows(headers, rows):
+    """Render rows as tab-separated text, buffered and flushed once."""
+    buf = io.StringIO()
+    write = buf.write
+    write("\t".join(headers))
+    write("\n")
+    for row in rows:
+        write("\t".join(row))
+        write("\n")
+    console.file.write(buf.getvalue())
+
+
+def _run_with_status(description: str, work):
+    """Run work() with a spinner on interactive terminals only.
+
+    On non-TTY stdout (CI, piped output) Rich's Progress still runs a
+    background refresh thread writing ANSI resets nobody sees, so print
+    a single status line instead. On a TTY, a transient spinner with a
+    reduced refresh rate keeps the per-tick overhead down.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    if not console.is_terminal:
+        console.print(description)
+        return work()
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True,
+        refresh_per_second=4
+    ) as progress:
+        progress.add_task(description, total=None)
+        return work()
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp.
+
+    datetime.utcnow() is deprecated on 3.12+ and measurably slower than
+    deriving from the tz-aware clock; callers compute this once per
+    command and reuse it.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _hostname_filter(pattern: str):
+    """Build a hostname filter for the --device option.
+
+    Without an explicit wildcard the pattern is treated as an anchored
+    prefix match, which the hostname btree index can serve; a leading %
+    would force a sequential scan. Users can still pass % / _ for a
+    contains-style search (served by the trigram index on PostgreSQL).
+    """
+    if "%" in pattern or "_" in pattern:
+        return Device.hostname.ilike(pattern)
+    return Device.hostname.ilike(f"{pattern}%")
+
+
+def _cli_session():
+    """Return the session shared across a single CLI invocation.
+
+    Read-only commands reuse one session (a single pooled-connection
+    checkout and transaction BEGIN) instead of each opening their own;
+    the group's result callback commits and closes it once the
+    invocation finishes.
+    """
+    # Stored on ctx.meta, which click shares across the whole context
+    # tree: the group's result callback runs with the group context
+    # current, whose obj is separate from the subcommand's, so a
+    # session stashed there would never be seen by the cleanup.
+    ctx = click.get_current_context()
+    session = ctx.meta.get("cli_session")
+    if session is None:
+        session = ctx.meta["cli_session"] = db_manager.get_session_sync()
+    return session
+
+
 def setup_logging():
     """Setup structured logging."""
+    # Bypass the stdlib logging bridge entirely and serialize with orjson:
+    # BytesLoggerFactory writes bytes straight to stdout, so each log call
+    # skips stdlib dispatch and the pure-Python JSON encoder.
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=orjson.dumps)
         ],
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        logger_factory=structlog.BytesLoggerFactory(),
+        wrapper_class=structlog.BoundLogger,
         cache_logger_on_first_use=True,
     )
 
@@ -49,9 +167,17 @@ def cli(debug: bool, config_file: Optional[str]):
         config.log_level = "DEBUG"
     
     setup_logging()
-    
-    # Initialize database
-    db_manager.initialize()
+
+
+@cli.result_callback()
+def _close_cli_session(result, **kwargs):
+    """Commit and close the invocation-scoped session, if one was opened."""
+    session = click.get_current_context().meta.pop("cli_session", None)
+    if session is not None:
+        try:
+            session.commit()
+        finally:
+            session.close()
 
 
 @cli.command()
@@ -69,55 +195,56 @@ def init_db():
 @cli.command()
 @click.option('--device', help='Collect from specific device')
 @click.option('--dry-run', is_flag=True, help='Show what would be collected without storing')
-def collect(device: Optional[str], dry_run: bool):
+@click.option('--concurrency', type=int, default=None,
+              help='Number of devices to collect in parallel (default: MAX_WORKERS)')
+def collect(device: Optional[str], dry_run: bool, concurrency: Optional[int]):
     """Collect routing tables from devices."""
+    # Imported lazily: the collector drags in Nornir/Netmiko, which the
+    # read-only commands never need.
+    from .collector import RouteTableCollector
+
+    # Device collection is I/O bound; the collector fans out across its
+    # Nornir thread workers, so this just raises/lowers that ceiling.
+    if concurrency is not None:
+        config.max_workers = max(1, concurrency)
+
     try:
         collector = RouteTableCollector()
         
         if device:
             # Collect from specific device
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task(f"Collecting from {device}...", total=None)
-                
-                if dry_run:
-                    console.print(f"Would collect routing table from: {device}")
+            if dry_run:
+                console.print(f"Would collect routing table from: {device}")
+            else:
+                success = _run_with_status(
+                    f"Collecting from {device}...",
+                    lambda: collector.collect_device(device)
+                )
+                if success:
+                    console.print(f"✅ Successfully collected from {device}", style="bold green")
                 else:
-                    success = collector.collect_device(device)
-                    if success:
-                        console.print(f"✅ Successfully collected from {device}", style="bold green")
-                    else:
-                        console.print(f"❌ Failed to collect from {device}", style="bold red")
-                        sys.exit(1)
+                    console.print(f"❌ Failed to collect from {device}", style="bold red")
+                    sys.exit(1)
         else:
             # Collect from all devices
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Collecting from all devices...", total=None)
-                
-                if dry_run:
-                    console.print("Would collect routing tables from all configured devices")
-                else:
-                    summary = collector.collect_all_devices()
-                    
-                    # Display summary table
-                    table = Table(title="Collection Summary")
-                    table.add_column("Metric", style="cyan")
-                    table.add_column("Value", style="magenta")
-                    
-                    table.add_row("Total Devices", str(summary["total_devices"]))
-                    table.add_row("Successful", str(summary["successful"]))
-                    table.add_row("Failed", str(summary["failed"]))
-                    table.add_row("Total Routes", str(summary["total_routes"]))
-                    table.add_row("Elapsed Time", f"{summary['elapsed_time']:.2f}s")
-                    
-                    console.print(table)
+            if dry_run:
+                console.print("Would collect routing tables from all configured devices")
+            else:
+                summary = _run_with_status(
+                    "Collecting from all devices...",
+                    collector.collect_all_devices
+                )
+
+                # Display summary table
+                table = _build_table("Collection Summary", _METRIC_COLS)
+
+                table.add_row("Total Devices", str(summary["total_devices"]))
+                table.add_row("Successful", str(summary["successful"]))
+                table.add_row("Failed", str(summary["failed"]))
+                table.add_row("Total Routes", str(summary["total_routes"]))
+                table.add_row("Elapsed Time", f"{summary['elapsed_time']:.2f}s")
+
+                console.print(table)
     
     except Exception as e:
         console.print(f"❌ Collection failed: {e}", style="bold red")
@@ -128,6 +255,8 @@ def collect(device: Optional[str], dry_run: bool):
 @cli.command()
 def scheduler():
     """Run the periodic collection scheduler."""
+    from .scheduler import RouteTableScheduler
+
     try:
         scheduler = RouteTableScheduler()
         
@@ -150,40 +279,42 @@ def scheduler():
 @click.option('--limit', default=20, help='Limit number of results')
 def devices(device: Optional[str], limit: int):
     """List devices in the database."""
-    with db_manager.get_session() as session:
-        query = session.query(Device)
-        
-        if device:
-            query = query.filter(Device.hostname.like(f"%{device}%"))
-        
-        devices_list = query.limit(limit).all()
-        
-        if not devices_list:
-            console.print("No devices found", style="yellow")
-            return
-        
-        table = Table(title="Devices")
-        table.add_column("Hostname", style="cyan")
-        table.add_column("IP Address", style="blue")
-        table.add_column("Vendor", style="green")
-        table.add_column("Platform", style="magenta")
-        table.add_column("Last Seen", style="yellow")
-        table.add_column("Status", style="red")
-        
-        for dev in devices_list:
-            last_seen = dev.last_seen.strftime("%Y-%m-%d %H:%M") if dev.last_seen else "Never"
-            status = "Active" if dev.is_active else "Inactive"
-            
-            table.add_row(
-                dev.hostname,
-                str(dev.ip_address),
-                dev.vendor,
-                dev.platform,
-                last_seen,
-                status
-            )
-        
-        console.print(table)
+    session = _cli_session()
+    query = session.query(Device)
+    
+    if device:
+        query = query.filter(_hostname_filter(device))
+    
+    devices_list = query.limit(limit).all()
+    
+    if not devices_list:
+        console.print("No devices found", style="yellow")
+        return
+    
+    headers = tuple(header for header, _ in _DEVICE_COLS)
+    rows = []
+    for dev in devices_list:
+        last_seen = _FMT_MINUTE(dev.last_seen) if dev.last_seen else "Never"
+        status = "Active" if dev.is_active else "Inactive"
+
+        rows.append((
+            dev.hostname,
+            str(dev.ip_address),
+            dev.vendor,
+            dev.platform,
+            last_seen,
+            status
+        ))
+
+    if len(rows) > _PLAIN_TABLE_THRESHOLD:
+        _print_plain_rows(headers, rows)
+        return
+
+    table = _build_table("Devices", _DEVICE_COLS)
+    for row in rows:
+        table.add_row(*row)
+
+    console.print(table)
 
 
 @cli.command()
@@ -193,49 +324,69 @@ def devices(device: Optional[str], limit: int):
 @click.option('--limit', default=50, help='Limit number of results')
 def routes(device: Optional[str], vrf: Optional[str], protocol: Optional[str], limit: int):
     """Display routes from the database."""
-    with db_manager.get_session() as session:
-        # Build query with joins
-        query = session.query(Route).join(VRF).join(Device)
-        
-        if device:
-            query = query.filter(Device.hostname.like(f"%{device}%"))
-        
-        if vrf:
-            query = query.filter(VRF.name == vrf)
-        
-        if protocol:
-            query = query.filter(Route.protocol.like(f"%{protocol}%"))
-        
-        # Get latest routes only
-        query = query.join(CollectionRun).filter(
-            CollectionRun.status == "completed"
-        ).order_by(CollectionRun.completed_at.desc())
-        
-        routes_list = query.limit(limit).all()
-        
-        if not routes_list:
-            console.print("No routes found", style="yellow")
-            return
-        
-        table = Table(title="Routes")
-        table.add_column("Device", style="cyan")
-        table.add_column("VRF", style="blue")
-        table.add_column("Network", style="green")
-        table.add_column("Next Hop", style="magenta")
-        table.add_column("Protocol", style="yellow")
-        table.add_column("Metric", style="red")
-        
-        for route in routes_list:
-            table.add_row(
-                route.vrf.device.hostname,
-                route.vrf.name,
-                f"{route.destination}/{route.prefix_length}",
-                route.next_hop or "N/A",
-                route.protocol,
-                str(route.metric) if route.metric is not None else "N/A"
-            )
-        
-        console.print(table)
+    session = _cli_session()
+    # Build query with joins; contains_eager hydrates the VRF/Device
+    # relationships from the same JOIN so the display loop doesn't
+    # issue a lazy SELECT per row.
+    query = session.query(Route).join(Route.vrf).join(VRF.device).options(
+        contains_eager(Route.vrf).contains_eager(VRF.device)
+    )
+
+    if device:
+        query = query.filter(_hostname_filter(device))
+
+    if vrf:
+        query = query.filter(VRF.name == vrf)
+
+    if protocol:
+        query = query.filter(Route.protocol.like(f"%{protocol}%"))
+
+    # Restrict to each device's latest completed collection run so we
+    # return the current snapshot instead of scanning (and mixing in)
+    # every historical run.
+    latest_runs = session.query(
+        CollectionRun.device_id.label("device_id"),
+        func.max(CollectionRun.completed_at).label("completed_at")
+    ).filter(
+        CollectionRun.status == "completed"
+    ).group_by(CollectionRun.device_id).subquery()
+
+    query = query.join(Route.collection_run).join(
+        latest_runs,
+        and_(
+            CollectionRun.device_id == latest_runs.c.device_id,
+            CollectionRun.completed_at == latest_runs.c.completed_at
+        )
+    )
+    
+    routes_list = query.limit(limit).all()
+    
+    if not routes_list:
+        console.print("No routes found", style="yellow")
+        return
+    
+    headers = tuple(header for header, _ in _ROUTE_COLS)
+    rows = [
+        (
+            route.vrf.device.hostname,
+            route.vrf.name,
+            f"{route.destination}/{route.prefix_length}",
+            route.next_hop or "N/A",
+            route.protocol,
+            str(route.metric) if route.metric is not None else "N/A"
+        )
+        for route in routes_list
+    ]
+
+    if len(rows) > _PLAIN_TABLE_THRESHOLD:
+        _print_plain_rows(headers, rows)
+        return
+
+    table = _build_table("Routes", _ROUTE_COLS)
+    for row in rows:
+        table.add_row(*row)
+
+    console.print(table)
 
 
 @cli.command()
@@ -244,102 +395,180 @@ def routes(device: Optional[str], vrf: Optional[str], protocol: Optional[str], l
 @click.option('--limit', default=50, help='Limit number of results')
 def changes(device: Optional[str], days: int, limit: int):
     """Show routing table changes."""
-    with db_manager.get_session() as session:
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        query = session.query(ChangeLog).join(Device).filter(
-            ChangeLog.detected_at >= cutoff_date
+    session = _cli_session()
+    cutoff_date = _utcnow() - timedelta(days=days)
+    
+    # selectinload batches the Device lookup into one IN query, so the
+    # display loop never lazy-loads and the Device join is only added
+    # when we actually filter on it.
+    query = session.query(ChangeLog).options(
+        selectinload(ChangeLog.device)
+    ).filter(
+        ChangeLog.detected_at >= cutoff_date
+    )
+
+    if device:
+        query = query.join(ChangeLog.device).filter(_hostname_filter(device))
+    
+    changes_list = query.order_by(ChangeLog.detected_at.desc()).limit(limit).all()
+    
+    if not changes_list:
+        console.print("No changes found", style="yellow")
+        return
+    
+    headers = tuple(header for header, _ in _CHANGE_COLS)
+    rows = [
+        (
+            change.device.hostname,
+            change.vrf_name,
+            change.change_type.upper(),
+            change.route_network,
+            _FMT_MINUTE(change.detected_at)
         )
-        
-        if device:
-            query = query.filter(Device.hostname.like(f"%{device}%"))
-        
-        changes_list = query.order_by(ChangeLog.detected_at.desc()).limit(limit).all()
-        
-        if not changes_list:
-            console.print("No changes found", style="yellow")
-            return
-        
-        table = Table(title="Routing Changes")
-        table.add_column("Device", style="cyan")
-        table.add_column("VRF", style="blue")
-        table.add_column("Change Type", style="green")
-        table.add_column("Network", style="magenta")
-        table.add_column("Detected", style="yellow")
-        
-        for change in changes_list:
-            detected = change.detected_at.strftime("%Y-%m-%d %H:%M")
-            
-            table.add_row(
-                change.device.hostname,
-                change.vrf_name,
-                change.change_type.upper(),
-                change.route_network,
-                detected
+        for change in changes_list
+    ]
+
+    if len(rows) > _PLAIN_TABLE_THRESHOLD:
+        _print_plain_rows(headers, rows)
+        return
+
+    table = _build_table("Routing Changes", _CHANGE_COLS)
+    for row in rows:
+        table.add_row(*row)
+
+    console.print(table)
+
+
+# Short-lived memoization so watcher loops re-invoking stats hit a dict
+# lookup instead of re-running the same queries every few seconds.
+_device_stats_cache = TTLCache(maxsize=512, ttl=30)
+_global_stats_cache = TTLCache(maxsize=1, ttl=10)
+
+
+@cached(_device_stats_cache)
+def _device_stats(hostname_pattern: str) -> Optional[dict]:
+    """Fetch latest-run statistics for a device as a plain dict."""
+    with db_manager.get_session() as session:
+        dev = session.query(Device).filter(
+            _hostname_filter(hostname_pattern)
+        ).first()
+        if not dev:
+            return None
+
+        # Get latest collection run
+        latest_run = session.query(CollectionRun).filter_by(
+            device_id=dev.id,
+            status="completed"
+        ).order_by(CollectionRun.completed_at.desc()).first()
+
+        if not latest_run:
+            return {"hostname": dev.hostname}
+
+        return {
+            "hostname": dev.hostname,
+            "last_collection": latest_run.completed_at,
+            "total_routes": latest_run.total_routes,
+            "total_vrfs": latest_run.total_vrfs,
+            "processing_time": latest_run.processing_time,
+            "routes_added": latest_run.routes_added,
+            "routes_removed": latest_run.routes_removed,
+            "routes_modified": latest_run.routes_modified,
+        }
+
+
+@cached(_global_stats_cache)
+def _global_stats() -> dict:
+    """Fetch global collection statistics as a plain dict."""
+    with db_manager.get_session() as session:
+        # One SELECT with scalar subqueries instead of five separate
+        # count queries (and five DB roundtrips).
+        cutoff = _utcnow() - timedelta(hours=24)
+        (total_devices, active_devices, total_routes,
+         total_vrfs, recent_runs) = session.execute(
+            select(
+                func.count(Device.id),
+                func.count(case((Device.is_active.is_(True), 1))),
+                select(func.count(Route.id)).scalar_subquery(),
+                select(func.count(VRF.id)).scalar_subquery(),
+                select(func.count(CollectionRun.id)).where(
+                    CollectionRun.completed_at >= cutoff
+                ).scalar_subquery(),
             )
-        
-        console.print(table)
+        ).one()
+
+        return {
+            "total_devices": total_devices,
+            "active_devices": active_devices,
+            "total_routes": total_routes,
+            "total_vrfs": total_vrfs,
+            "recent_runs": recent_runs,
+        }
 
 
 @cli.command()
 @click.option('--device', help='Show statistics for specific device')
 def stats(device: Optional[str]):
     """Show collection statistics."""
-    with db_manager.get_session() as session:
-        if device:
-            # Device-specific stats
-            dev = session.query(Device).filter(Device.hostname.like(f"%{device}%")).first()
-            if not dev:
-                console.print(f"Device not found: {device}", style="red")
-                return
-            
-            # Get latest collection run
-            latest_run = session.query(CollectionRun).filter_by(
-                device_id=dev.id,
-                status="completed"
-            ).order_by(CollectionRun.completed_at.desc()).first()
-            
-            if not latest_run:
-                console.print(f"No collection data found for {device}", style="yellow")
-                return
-            
-            table = Table(title=f"Statistics for {dev.hostname}")
-            table.add_column("Metric", style="cyan")
-            table.add_column("Value", style="magenta")
-            
-            table.add_row("Last Collection", latest_run.completed_at.strftime("%Y-%m-%d %H:%M:%S"))
-            table.add_row("Total Routes", str(latest_run.total_routes))
-            table.add_row("Total VRFs", str(latest_run.total_vrfs))
-            table.add_row("Processing Time", f"{latest_run.processing_time:.2f}s")
-            table.add_row("Routes Added", str(latest_run.routes_added))
-            table.add_row("Routes Removed", str(latest_run.routes_removed))
-            table.add_row("Routes Modified", str(latest_run.routes_modified))
-            
-            console.print(table)
-        
-        else:
-            # Global stats
-            total_devices = session.query(Device).count()
-            active_devices = session.query(Device).filter_by(is_active=True).count()
-            total_routes = session.query(Route).count()
-            total_vrfs = session.query(VRF).count()
-            
-            # Recent collection stats
-            recent_runs = session.query(CollectionRun).filter(
-                CollectionRun.completed_at >= datetime.utcnow() - timedelta(hours=24)
-            ).count()
-            
-            table = Table(title="Global Statistics")
-            table.add_column("Metric", style="cyan")
-            table.add_column("Value", style="magenta")
-            
-            table.add_row("Total Devices", str(total_devices))
-            table.add_row("Active Devices", str(active_devices))
-            table.add_row("Total Routes", str(total_routes))
-            table.add_row("Total VRFs", str(total_vrfs))
-            table.add_row("Collections (24h)", str(recent_runs))
-            
-            console.print(table)
+    if device:
+        device_stats = _device_stats(device)
+        if device_stats is None:
+            console.print(f"Device not found: {device}", style="red")
+            return
+
+        if "last_collection" not in device_stats:
+            console.print(f"No collection data found for {device}", style="yellow")
+            return
+
+        table = _build_table(f"Statistics for {device_stats['hostname']}", _METRIC_COLS)
+
+        table.add_row("Last Collection", _FMT_SECOND(device_stats["last_collection"]))
+        table.add_row("Total Routes", str(device_stats["total_routes"]))
+        table.add_row("Total VRFs", str(device_stats["total_vrfs"]))
+        table.add_row("Processing Time", f"{device_stats['processing_time']:.2f}s")
+        table.add_row("Routes Added", str(device_stats["routes_added"]))
+        table.add_row("Routes Removed", str(device_stats["routes_removed"]))
+        table.add_row("Routes Modified", str(device_stats["routes_modified"]))
+
+        console.print(table)
+
+    else:
+        global_stats = _global_stats()
+
+        table = _build_table("Global Statistics", _METRIC_COLS)
+
+        table.add_row("Total Devices", str(global_stats["total_devices"]))
+        table.add_row("Active Devices", str(global_stats["active_devices"]))
+        table.add_row("Total Routes", str(global_stats["total_routes"]))
+        table.add_row("Total VRFs", str(global_stats["total_vrfs"]))
+        table.add_row("Collections (24h)", str(global_stats["recent_runs"]))
+
+        console.print(table)
+
+
+# Column order for route exports (JSON object keys and CSV header).
+_EXPORT_FIELDS = (
+    "device", "vrf", "destination", "prefix_length", "network", "next_hop",
+    "protocol", "metric", "admin_distance", "interface", "as_path",
+    "collected_at"
+)
+
+
+def _route_to_dict(route) -> dict:
+    """Build the export record for a single route."""
+    return {
+        "device": route.vrf.device.hostname,
+        "vrf": route.vrf.name,
+        "destination": str(route.destination),
+        "prefix_length": route.prefix_length,
+        "network": f"{route.destination}/{route.prefix_length}",
+        "next_hop": route.next_hop,
+        "protocol": route.protocol,
+        "metric": route.metric,
+        "admin_distance": route.admin_distance,
+        "interface": route.interface,
+        "as_path": route.as_path,
+        "collected_at": route.created_at
+    }
 
 
 @cli.command()
@@ -349,60 +578,124 @@ def stats(device: Optional[str]):
 @click.option('--format', 'output_format', type=click.Choice(['json', 'csv']), default='json', help='Output format')
 def export(output: str, device: Optional[str], vrf: Optional[str], output_format: str):
     """Export routes to JSON or CSV."""
-    with db_manager.get_session() as session:
-        # Build query
-        query = session.query(Route).join(VRF).join(Device).join(CollectionRun).filter(
-            CollectionRun.status == "completed"
-        )
-        
+    session = _cli_session()
+    # Build query; eager-load VRF/Device off the same JOIN so the
+    # per-row serialization doesn't trigger lazy SELECTs.
+    stmt = select(Route).join(Route.vrf).join(VRF.device).join(
+        Route.collection_run
+    ).options(
+        contains_eager(Route.vrf).contains_eager(VRF.device)
+    ).where(
+        CollectionRun.status == "completed"
+    )
+
+    if device:
+        stmt = stmt.where(_hostname_filter(device))
+
+    if vrf:
+        stmt = stmt.where(VRF.name == vrf)
+
+    # CSV on PostgreSQL: let the server emit CSV directly via COPY so
+    # the rows never become Python objects at all. Other backends fall
+    # through to the generic streaming path below.
+    if output_format == 'csv' and session.get_bind().dialect.name == "postgresql":
+        copy_stmt = select(
+            Device.hostname.label("device"),
+            VRF.name.label("vrf"),
+            Route.destination.label("destination"),
+            Route.prefix_length.label("prefix_length"),
+            # Stored generated column (see DatabaseManager DDL hook);
+            # reading it beats re-concatenating the pair per row.
+            literal_column("routes.network").label("network"),
+            Route.next_hop.label("next_hop"),
+            Route.protocol.label("protocol"),
+            Route.metric.label("metric"),
+            Route.admin_distance.label("admin_distance"),
+            Route.interface.label("interface"),
+            Route.as_path.label("as_path"),
+            Route.created_at.label("collected_at"),
+        ).select_from(Route).join(Route.vrf).join(VRF.device).join(
+            Route.collection_run
+        ).where(CollectionRun.status == "completed")
+
         if device:
-            query = query.filter(Device.hostname.like(f"%{device}%"))
-        
+            copy_stmt = copy_stmt.where(_hostname_filter(device))
         if vrf:
-            query = query.filter(VRF.name == vrf)
-        
-        routes_list = query.all()
-        
-        if not routes_list:
-            console.print("No routes found to export", style="yellow")
-            return
-        
-        # Prepare data
-        data = []
-        for route in routes_list:
-            route_data = {
-                "device": route.vrf.device.hostname,
-                "vrf": route.vrf.name,
-                "destination": str(route.destination),
-                "prefix_length": route.prefix_length,
-                "network": f"{route.destination}/{route.prefix_length}",
-                "next_hop": route.next_hop,
-                "protocol": route.protocol,
-                "metric": route.metric,
-                "admin_distance": route.admin_distance,
-                "interface": route.interface,
-                "as_path": route.as_path,
-                "collected_at": route.created_at.isoformat()
-            }
-            data.append(route_data)
-        
-        # Write output
+            copy_stmt = copy_stmt.where(VRF.name == vrf)
+
         try:
-            if output_format == 'json':
-                with open(output, 'w') as f:
-                    json.dump(data, f, indent=2, default=str)
-            elif output_format == 'csv':
-                import csv
-                if data:
-                    with open(output, 'w', newline='') as f:
-                        writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(data)
-            
-            console.print(f"✅ Exported {len(data)} routes to {output}", style="bold green")
-        
+            sql = copy_stmt.compile(
+                session.get_bind(), compile_kwargs={"literal_binds": True}
+            )
+            cursor = session.connection().connection.cursor()
+            with open(output, 'w', newline='') as f:
+                cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH CSV HEADER", f)
+            if cursor.rowcount:
+                console.print(f"✅ Exported {cursor.rowcount} routes to {output}",
+                              style="bold green")
+            else:
+                console.print("No routes found to export", style="yellow")
         except Exception as e:
             console.print(f"❌ Export failed: {e}", style="bold red")
+        return
+
+    # Stream rows with a server-side cursor instead of materializing
+    # the full result list, and expunge each ORM object once it has
+    # been handed to the writer so the identity map stays bounded.
+    stmt = stmt.execution_options(yield_per=500, stream_results=True)
+
+    def _stream_routes():
+        # No unique() here: the eager loads are all many-to-one, so
+        # rows never duplicate, and yield_per refuses to combine with
+        # uniquing on 1.4.
+        for route in session.execute(stmt).scalars():
+            yield route
+            session.expunge(route)
+
+    route_iter = _stream_routes()
+    try:
+        first_route = next(route_iter)
+    except StopIteration:
+        console.print("No routes found to export", style="yellow")
+        return
+
+    route_iter = itertools.chain([first_route], route_iter)
+
+    # Write output
+    count = 0
+    try:
+        if output_format == 'json':
+            with open(output, 'wb') as f:
+                f.write(b"[")
+                for route in route_iter:
+                    if count:
+                        f.write(b",\n")
+                    # orjson serializes datetime/UUID natively; the
+                    # timestamps are stored as naive UTC, so tag them
+                    # with the UTC offset on the way out.
+                    f.write(orjson.dumps(
+                        _route_to_dict(route),
+                        option=(orjson.OPT_INDENT_2
+                                | orjson.OPT_NAIVE_UTC
+                                | orjson.OPT_SERIALIZE_UUID)
+                    ))
+                    count += 1
+                f.write(b"]")
+        elif output_format == 'csv':
+            import csv
+            with open(output, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(_EXPORT_FIELDS)
+                for route in route_iter:
+                    record = _route_to_dict(route)
+                    record["collected_at"] = record["collected_at"].isoformat()
+                    writer.writerow([record[field] for field in _EXPORT_FIELDS])
+                    count += 1
+
+        console.print(f"✅ Exported {count} routes to {output}", style="bold green")
+
+    except Exception as e:
+        console.print(f"❌ Export failed: {e}", style="bold red")
 
 
 if __name__ == '__main__':
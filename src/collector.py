@@ -1,7 +1,11 @@
 """Main route table collector using Nornir."""
+import csv
+import hashlib
+import io
+import json
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Tuple, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import structlog
 from nornir import InitNornir
@@ -10,26 +14,80 @@ from nornir.core.filter import F
 from nornir_netmiko.tasks import netmiko_send_command
 from nornir_napalm.tasks import napalm_get
 from nornir_scrapli.tasks import send_command as scrapli_send_command
+from sqlalchemy import text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from uuid6 import uuid7
 
 from .config import config
 from .database import db_manager
 from .models import Device, VRF, Route, CollectionRun, ChangeLog
-from .parsers import CiscoParser, JuniperParser, HuaweiParser
+from .parsers import get_parser
 from .parsers.base import ParsedRoute, VRFInfo
 
 logger = structlog.get_logger(__name__)
 
 
+# Columns written by the COPY fast path, in routes-table order. The id
+# is a server-side identity; created_at is generated client-side because
+# its default is Python-side and COPY bypasses the ORM.
+_ROUTE_COPY_COLUMNS = (
+    "vrf_id", "collection_run_id", "destination", "prefix_length",
+    "next_hop", "protocol", "metric", "admin_distance", "interface",
+    "as_path", "local_preference", "med", "communities", "route_type",
+    "created_at",
+)
+
+# Rows serialized per COPY statement before the CSV buffer is flushed
+# and reused, capping peak memory for very large routing tables.
+_COPY_BATCH_ROWS = 10000
+
+
+def _maybe_int(value) -> Optional[int]:
+    """Coerce a TextFSM field to int, or None for empty/garbage values."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _routes_from_textfsm(records: List[Dict], vrf: str, parser) -> List[ParsedRoute]:
+    """Adapt NTC-template records to ParsedRoute entries.
+
+    Netmiko lower-cases the TextFSM headers, so the common route
+    templates yield network/mask/nexthop_ip/nexthop_if/protocol/
+    distance/metric keys.
+    """
+    routes = []
+    for rec in records:
+        network = rec.get("network")
+        if not network:
+            continue
+
+        prefix_length = _maybe_int(rec.get("mask"))
+        if prefix_length is None:
+            prefix_length = 32
+
+        protocol = rec.get("protocol") or ""
+        routes.append(ParsedRoute(
+            destination=network,
+            prefix_length=prefix_length,
+            next_hop=rec.get("nexthop_ip") or None,
+            protocol=parser.normalize_protocol(protocol) if protocol else "UNKNOWN",
+            metric=_maybe_int(rec.get("metric")),
+            admin_distance=_maybe_int(rec.get("distance")),
+            interface=rec.get("nexthop_if") or None,
+            vrf=vrf,
+        ))
+
+    return routes
+
+
 class RouteTableCollector:
     """Main collector class for routing table data."""
     
     def __init__(self):
         self.nr = None
-        self.parsers = {
-            "cisco": CiscoParser(),
-            "juniper": JuniperParser(),
-            "huawei": HuaweiParser(),
-        }
+        self._host_filters = {}
         self.logger = logger
         self._initialize_nornir()
     
@@ -37,6 +95,13 @@ class RouteTableCollector:
         """Initialize Nornir with inventory."""
         try:
             self.nr = InitNornir(
+                # The threaded runner's pool size is fixed here at init
+                # time; this is the only place max_workers can take
+                # effect (run() kwargs go to the task, not the runner).
+                runner={
+                    "plugin": "threaded",
+                    "options": {"num_workers": config.max_workers},
+                },
                 inventory={
                     "options": {
                         "host_file": config.inventory_hosts,
@@ -46,34 +111,43 @@ class RouteTableCollector:
                 },
                 logging={"enabled": False}  # We'll use our own logging
             )
-            self.logger.info("Nornir initialized successfully", 
+            # Inventory and platforms are fixed for the collector's
+            # lifetime, so resolve each host's parser and name filter
+            # once here instead of per task run.
+            for h in self.nr.inventory.hosts.values():
+                h.data["_parser"] = self.get_parser(h.platform)
+            self._host_filters = {
+                name: F(name=name) for name in self.nr.inventory.hosts
+            }
+
+            self.logger.info("Nornir initialized successfully",
                            host_count=len(self.nr.inventory.hosts))
         except Exception as e:
             self.logger.error("Failed to initialize Nornir", error=str(e))
             raise
     
+    def close_connections(self):
+        """Close SSH connections held open between collection cycles.
+
+        Nornir keeps each host's Netmiko connection on the Host object
+        after a run, so repeated polling reuses the session instead of
+        paying the SSH handshake every cycle. Call this on shutdown.
+        """
+        try:
+            self.nr.close_connections(on_good=True, on_failed=True)
+            self.logger.info("Device connections closed")
+        except Exception as e:
+            self.logger.warning("Error closing device connections", error=str(e))
+
     def get_parser(self, vendor: str) -> Optional[Any]:
         """Get parser for a vendor."""
-        vendor_lower = vendor.lower()
-        
-        # Map common vendor names
-        vendor_map = {
-            "ios": "cisco",
-            "iosxe": "cisco", 
-            "iosxr": "cisco",
-            "nxos": "cisco",
-            "junos": "juniper",
-            "vrp": "huawei",
-        }
-        
-        mapped_vendor = vendor_map.get(vendor_lower, vendor_lower)
-        return self.parsers.get(mapped_vendor)
+        return get_parser(vendor)
     
     def collect_device_info(self, task: Task) -> Result:
         """Nornir task to collect device information."""
         host = task.host
-        parser = self.get_parser(host.platform)
-        
+        parser = host.data.get("_parser") or self.get_parser(host.platform)
+
         if not parser:
             return Result(
                 host=host,
@@ -91,35 +165,74 @@ class RouteTableCollector:
             )
             
             vrfs = parser.parse_vrf_list(vrf_result.result)
-            
-            # Collect routing tables for each VRF
+
+            # Collect routing tables for each VRF. Commands stay
+            # sequential -- Netmiko serializes on a single SSH channel --
+            # but parsing each VRF's output is handed to a worker thread
+            # so the CPU-bound parse overlaps the next round-trip.
             all_routes = []
-            for vrf_info in vrfs:
-                try:
-                    rt_command = parser.get_routing_table_command(vrf_info.name)
-                    rt_result = task.run(
-                        netmiko_send_command,
-                        command_string=rt_command,
-                        use_textfsm=False
-                    )
-                    
-                    routes = parser.parse_routing_table(rt_result.result, vrf_info.name)
-                    all_routes.extend(routes)
-                    
-                    self.logger.info("Collected routes", 
-                                   host=host.name, vrf=vrf_info.name, 
-                                   route_count=len(routes))
-                
-                except Exception as e:
-                    self.logger.warning("Failed to collect VRF routes", 
-                                      host=host.name, vrf=vrf_info.name, 
-                                      error=str(e))
+            parse_futures = []
+            hasher = hashlib.sha256()
+            with ThreadPoolExecutor(max_workers=2) as parse_pool:
+                for vrf_info in vrfs:
+                    try:
+                        rt_command = parser.get_routing_table_command(vrf_info.name)
+                        rt_result = task.run(
+                            netmiko_send_command,
+                            command_string=rt_command,
+                            use_textfsm=True
+                        )
+
+                        # TextFSM returns structured records when an NTC
+                        # template matches; otherwise the raw string falls
+                        # through to the hand-rolled parser.
+                        rt_output = rt_result.result
+
+                        # Fold every VRF's output into one digest so
+                        # storage can skip unchanged tables.
+                        hasher.update(vrf_info.name.encode())
+                        if isinstance(rt_output, str):
+                            hasher.update(rt_output.encode())
+                        else:
+                            hasher.update(json.dumps(rt_output, default=str).encode())
+
+                        if isinstance(rt_output, list) and rt_output:
+                            parse_futures.append((vrf_info.name, parse_pool.submit(
+                                _routes_from_textfsm,
+                                rt_output,
+                                vrf_info.name,
+                                parser
+                            )))
+                        else:
+                            parse_futures.append((vrf_info.name, parse_pool.submit(
+                                parser.parse_routing_table,
+                                rt_output if isinstance(rt_output, str) else "",
+                                vrf_info.name
+                            )))
+
+                    except Exception as e:
+                        self.logger.warning("Failed to collect VRF routes",
+                                          host=host.name, vrf=vrf_info.name,
+                                          error=str(e))
+
+                for vrf_name, future in parse_futures:
+                    try:
+                        routes = future.result()
+                        all_routes.extend(routes)
+                        self.logger.info("Collected routes",
+                                       host=host.name, vrf=vrf_name,
+                                       route_count=len(routes))
+                    except Exception as e:
+                        self.logger.warning("Failed to parse VRF routes",
+                                          host=host.name, vrf=vrf_name,
+                                          error=str(e))
             
             return Result(
                 host=host,
                 result={
                     "vrfs": vrfs,
                     "routes": all_routes,
+                    "output_digest": hasher.digest(),
                     "collection_time": datetime.utcnow()
                 }
             )
@@ -129,176 +242,425 @@ class RouteTableCollector:
                             host=host.name, error=str(e))
             return Result(host=host, failed=True, exception=str(e))
     
-    def store_device_data(self, hostname: str, host_data: Dict, 
+    def _bulk_copy_routes(self, session, collection_run_id, vrf_map: Dict,
+                          routes_data: List) -> int:
+        """Bulk-load routes with PostgreSQL COPY FROM STDIN.
+
+        Serializes rows into a tab-delimited CSV buffer and hands it to
+        the raw psycopg2 cursor, instead of one INSERT (plus ORM
+        bookkeeping) per route. The buffer is flushed to COPY every
+        _COPY_BATCH_ROWS rows so peak memory stays bounded regardless of
+        table size. Returns the number of rows written.
+        """
+        now = datetime.utcnow()
+        cursor = session.connection().connection.cursor()
+        copy_sql = (
+            "COPY routes ({}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')".format(
+                ", ".join(_ROUTE_COPY_COLUMNS)
+            )
+        )
+        buf = io.StringIO()
+        writer = csv.writer(buf, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+        count = 0
+        batched = 0
+
+        # Local bindings shave attribute/global lookups off the per-row
+        # work; this loop runs once per route.
+        vrf_get = vrf_map.get
+        writerow = writer.writerow
+        dumps = json.dumps
+
+        for route_data in routes_data:
+            vrf_id = vrf_get(route_data.vrf)
+            if not vrf_id:
+                continue
+
+            communities = route_data.communities
+            row = (
+                vrf_id, collection_run_id,
+                route_data.destination, route_data.prefix_length,
+                route_data.next_hop, route_data.protocol,
+                route_data.metric, route_data.admin_distance,
+                route_data.interface, route_data.as_path,
+                route_data.local_preference, route_data.med,
+                dumps(communities) if communities is not None else None,
+                route_data.route_type, now,
+            )
+            writerow([r"\N" if value is None else value for value in row])
+            count += 1
+            batched += 1
+
+            if batched >= _COPY_BATCH_ROWS:
+                buf.seek(0)
+                cursor.copy_expert(copy_sql, buf)
+                buf.seek(0)
+                buf.truncate()
+                batched = 0
+
+        if batched:
+            buf.seek(0)
+            cursor.copy_expert(copy_sql, buf)
+
+        return count
+
+    def store_device_data(self, hostname: str, host_data: Dict,
                          device_info: Dict) -> Optional[str]:
         """Store collected data in database."""
         with db_manager.get_session() as session:
             try:
-                # Get or create device
-                device = session.query(Device).filter_by(hostname=hostname).first()
-                if not device:
-                    device = Device(
-                        hostname=hostname,
-                        ip_address=host_data.get("hostname", hostname),
-                        vendor=device_info.get("vendor", "unknown"),
-                        platform=device_info.get("platform", "unknown"),
-                        os_version=device_info.get("os_version"),
-                        location=device_info.get("location")
+                now = datetime.utcnow()
+
+                on_postgres = session.get_bind().dialect.name == "postgresql"
+
+                if on_postgres:
+                    # Collection data is re-collected every cycle, so an
+                    # async commit losing the last few ms of WAL on a
+                    # crash just means this run is redone next poll.
+                    # Cuts the fsync wait out of every commit.
+                    session.execute(text("SET LOCAL synchronous_commit = off"))
+
+                    # One upsert resolves create-if-missing and the
+                    # last_seen touch in a single round-trip.
+                    device_id = session.execute(
+                        pg_insert(Device.__table__)
+                        .values(
+                            id=uuid7(),
+                            hostname=hostname,
+                            ip_address=host_data.get("hostname", hostname),
+                            vendor=device_info.get("vendor", "unknown"),
+                            platform=device_info.get("platform", "unknown"),
+                            os_version=device_info.get("os_version"),
+                            location=device_info.get("location"),
+                            last_seen=now,
+                            is_active=True,
+                        )
+                        .on_conflict_do_update(
+                            index_elements=["hostname"],
+                            set_={"last_seen": now, "is_active": True,
+                                  "updated_at": now},
+                        )
+                        .returning(Device.__table__.c.id)
+                    ).scalar()
+                else:
+                    # Get or create device; only the id is needed here,
+                    # so skip hydrating the full row.
+                    device_id = session.query(Device.id).filter_by(
+                        hostname=hostname
+                    ).scalar()
+                    if device_id is None:
+                        device = Device(
+                            hostname=hostname,
+                            ip_address=host_data.get("hostname", hostname),
+                            vendor=device_info.get("vendor", "unknown"),
+                            platform=device_info.get("platform", "unknown"),
+                            os_version=device_info.get("os_version"),
+                            location=device_info.get("location")
+                        )
+                        session.add(device)
+                        session.flush()  # Get device ID
+                        device_id = device.id
+
+                    session.execute(
+                        update(Device)
+                        .where(Device.id == device_id)
+                        .values(last_seen=now, is_active=True)
+                    )
+
+                # Skip storage entirely when the raw output digest
+                # matches the device's latest completed run: the route
+                # set cannot have changed, so refresh that run's
+                # timestamp instead of re-inserting identical rows.
+                output_digest = device_info.get("output_digest")
+                if output_digest is not None:
+                    prev = session.query(
+                        CollectionRun.id, CollectionRun.output_digest
+                    ).filter(
+                        CollectionRun.device_id == device_id,
+                        CollectionRun.status == "completed",
+                    ).order_by(CollectionRun.completed_at.desc()).first()
+
+                    if (prev is not None and prev.output_digest is not None
+                            and bytes(prev.output_digest) == output_digest):
+                        session.execute(
+                            update(CollectionRun)
+                            .where(CollectionRun.id == prev.id)
+                            .values(completed_at=now)
+                        )
+                        session.commit()
+                        self.logger.info("Route table unchanged, storage skipped",
+                                       hostname=hostname)
+                        return str(prev.id)
+
+                # Create collection run. The id is generated client-side,
+                # so a direct Core INSERT avoids the ORM add+flush that
+                # existed only to learn the new id.
+                run_id = uuid7()
+                session.execute(
+                    CollectionRun.__table__.insert().values(
+                        id=run_id,
+                        device_id=device_id,
+                        started_at=now,
+                        status="running",
+                        output_digest=output_digest,
                     )
-                    session.add(device)
-                    session.flush()  # Get device ID
-                
-                # Update last seen
-                device.last_seen = datetime.utcnow()
-                device.is_active = True
-                
-                # Create collection run
-                collection_run = CollectionRun(
-                    device_id=device.id,
-                    started_at=datetime.utcnow()
                 )
-                session.add(collection_run)
-                session.flush()  # Get run ID
-                
+
+
                 # Process VRFs and routes
                 vrfs_data = device_info.get("vrfs", [])
                 routes_data = device_info.get("routes", [])
                 
-                # Store VRFs
+                # Store VRFs: preload existing ids with one SELECT, then
+                # upsert the missing names in one statement, instead of a
+                # SELECT (and possible INSERT+flush) per VRF.
                 vrf_map = {}
-                for vrf_info in vrfs_data:
-                    vrf = session.query(VRF).filter_by(
-                        device_id=device.id, 
-                        name=vrf_info.name
-                    ).first()
-                    
-                    if not vrf:
-                        vrf = VRF(
-                            device_id=device.id,
-                            name=vrf_info.name,
-                            rd=vrf_info.rd,
-                            description=vrf_info.description
+                if vrfs_data:
+                    names = [vrf_info.name for vrf_info in vrfs_data]
+                    vrf_map = dict(
+                        session.query(VRF.name, VRF.id).filter(
+                            VRF.device_id == device_id,
+                            VRF.name.in_(names)
                         )
-                        session.add(vrf)
+                    )
+
+                missing = [v for v in vrfs_data if v.name not in vrf_map]
+                if missing:
+                    if on_postgres:
+                        stmt = (
+                            pg_insert(VRF.__table__)
+                            .values([
+                                {
+                                    "id": uuid7(),
+                                    "device_id": device_id,
+                                    "name": vrf_info.name,
+                                    "rd": vrf_info.rd,
+                                    "description": vrf_info.description,
+                                }
+                                for vrf_info in missing
+                            ])
+                            .on_conflict_do_nothing(
+                                index_elements=["device_id", "name"]
+                            )
+                            .returning(VRF.__table__.c.name, VRF.__table__.c.id)
+                        )
+                        vrf_map.update(session.execute(stmt))
+                    else:
+                        new_vrfs = [
+                            VRF(
+                                device_id=device_id,
+                                name=vrf_info.name,
+                                rd=vrf_info.rd,
+                                description=vrf_info.description
+                            )
+                            for vrf_info in missing
+                        ]
+                        session.add_all(new_vrfs)
                         session.flush()
-                    
-                    vrf_map[vrf_info.name] = vrf.id
+                        vrf_map.update((vrf.name, vrf.id) for vrf in new_vrfs)
                 
-                # Store routes
-                route_count = 0
-                for route_data in routes_data:
-                    vrf_id = vrf_map.get(route_data.vrf)
-                    if not vrf_id:
-                        continue
-                    
-                    route = Route(
-                        vrf_id=vrf_id,
-                        collection_run_id=collection_run.id,
-                        destination=route_data.destination,
-                        prefix_length=route_data.prefix_length,
-                        next_hop=route_data.next_hop,
-                        protocol=route_data.protocol,
-                        metric=route_data.metric,
-                        admin_distance=route_data.admin_distance,
-                        interface=route_data.interface,
-                        as_path=route_data.as_path,
-                        local_preference=route_data.local_preference,
-                        med=route_data.med,
-                        communities=route_data.communities,
-                        route_type=route_data.route_type
+                # Store routes: COPY on PostgreSQL, per-row ORM inserts
+                # elsewhere (SQLite dev setups).
+                if on_postgres:
+                    route_count = self._bulk_copy_routes(
+                        session, run_id, vrf_map, routes_data
                     )
-                    session.add(route)
-                    route_count += 1
+                else:
+                    # Single Core executemany instead of one ORM add()
+                    # (identity map, attribute history, per-row flush)
+                    # per route; id/created_at defaults are applied
+                    # per-row by the insert construct.
+                    vrf_get = vrf_map.get
+                    rows = [
+                        {
+                            "vrf_id": vrf_get(route_data.vrf),
+                            "collection_run_id": run_id,
+                            "destination": route_data.destination,
+                            "prefix_length": route_data.prefix_length,
+                            "next_hop": route_data.next_hop,
+                            "protocol": route_data.protocol,
+                            "metric": route_data.metric,
+                            "admin_distance": route_data.admin_distance,
+                            "interface": route_data.interface,
+                            "as_path": route_data.as_path,
+                            "local_preference": route_data.local_preference,
+                            "med": route_data.med,
+                            "communities": route_data.communities,
+                            "route_type": route_data.route_type,
+                        }
+                        for route_data in routes_data
+                        if vrf_get(route_data.vrf)
+                    ]
+                    route_count = len(rows)
+                    if rows:
+                        session.execute(Route.__table__.insert(), rows)
                 
                 # Update collection run statistics
-                collection_run.completed_at = datetime.utcnow()
-                collection_run.status = "completed"
-                collection_run.total_routes = route_count
-                collection_run.total_vrfs = len(vrfs_data)
-                collection_run.processing_time = (
-                    collection_run.completed_at - collection_run.started_at
-                ).total_seconds()
-                
+                completed_at = datetime.utcnow()
+                session.execute(
+                    update(CollectionRun)
+                    .where(CollectionRun.id == run_id)
+                    .values(
+                        completed_at=completed_at,
+                        status="completed",
+                        total_routes=route_count,
+                        total_vrfs=len(vrfs_data),
+                        processing_time=(completed_at - now).total_seconds(),
+                    )
+                )
+
                 session.commit()
-                
-                self.logger.info("Stored device data", 
-                               hostname=hostname, 
-                               routes=route_count, 
+
+                self.logger.info("Stored device data",
+                               hostname=hostname,
+                               routes=route_count,
                                vrfs=len(vrfs_data))
-                
-                return str(collection_run.id)
-            
+
+                return str(run_id)
+
             except Exception as e:
                 session.rollback()
-                self.logger.error("Failed to store device data", 
+                self.logger.error("Failed to store device data",
                                 hostname=hostname, error=str(e))
-                
-                # Update collection run with error
-                if 'collection_run' in locals():
-                    collection_run.status = "failed"
-                    collection_run.error_message = str(e)
-                    collection_run.completed_at = datetime.utcnow()
-                    session.commit()
-                
+
+                # Record the failed run; the rollback discarded the
+                # in-progress row — and, if the device was new in this
+                # transaction, its row too — so re-resolve the device
+                # before inserting. A failure while recording the
+                # failure must not escape this handler.
+                if 'run_id' in locals():
+                    try:
+                        device_id = session.query(Device.id).filter_by(
+                            hostname=hostname
+                        ).scalar()
+                        if device_id is None:
+                            device = Device(
+                                hostname=hostname,
+                                ip_address=host_data.get("hostname", hostname),
+                                vendor=device_info.get("vendor", "unknown"),
+                                platform=device_info.get("platform", "unknown"),
+                            )
+                            session.add(device)
+                            session.flush()
+                            device_id = device.id
+                        session.execute(
+                            CollectionRun.__table__.insert().values(
+                                id=run_id,
+                                device_id=device_id,
+                                started_at=now,
+                                completed_at=datetime.utcnow(),
+                                status="failed",
+                                error_message=str(e),
+                            )
+                        )
+                        session.commit()
+                    except Exception as record_error:
+                        session.rollback()
+                        self.logger.error("Failed to record failed run",
+                                        hostname=hostname,
+                                        error=str(record_error))
+
                 return None
     
+    def _store_failed_runs(self, failures: List[Tuple[str, str]]):
+        """Record failed collection runs in one transaction.
+
+        One IN-list SELECT resolves hostnames to device ids and one
+        executemany inserts all the failed-run rows, instead of a
+        session and a pair of statements per failed host.
+        """
+        now = datetime.utcnow()
+        with db_manager.get_session() as session:
+            id_map = dict(
+                session.query(Device.hostname, Device.id).filter(
+                    Device.hostname.in_([hostname for hostname, _ in failures])
+                )
+            )
+
+            rows = [
+                {
+                    "id": uuid7(),
+                    "device_id": id_map[hostname],
+                    "started_at": now,
+                    "completed_at": now,
+                    "status": "failed",
+                    "error_message": error,
+                }
+                for hostname, error in failures
+                if hostname in id_map
+            ]
+            if rows:
+                session.execute(CollectionRun.__table__.insert(), rows)
+                session.commit()
+
     def collect_all_devices(self) -> Dict[str, Any]:
         """Collect routing tables from all devices."""
         self.logger.info("Starting collection from all devices")
         start_time = time.time()
         
-        # Run collection tasks
-        results = self.nr.run(task=self.collect_device_info, num_workers=config.max_workers)
+        # Run collection tasks; parallelism comes from the threaded
+        # runner configured in _initialize_nornir.
+        results = self.nr.run(task=self.collect_device_info)
         
         # Process results
         success_count = 0
         failure_count = 0
         total_routes = 0
-        
-        for hostname, result in results.items():
-            host = self.nr.inventory.hosts[hostname]
-            
-            if result.failed:
-                failure_count += 1
-                self.logger.error("Collection failed", 
-                                hostname=hostname, 
-                                error=str(result.exception))
-                
-                # Store failed collection run
-                with db_manager.get_session() as session:
-                    device = session.query(Device).filter_by(hostname=hostname).first()
-                    if device:
-                        failed_run = CollectionRun(
-                            device_id=device.id,
-                            started_at=datetime.utcnow(),
-                            completed_at=datetime.utcnow(),
-                            status="failed",
-                            error_message=str(result.exception)
-                        )
-                        session.add(failed_run)
-                        session.commit()
-                continue
-            
-            # Store successful results
-            device_info = {
-                "vendor": getattr(host, "vendor", "unknown"),
-                "platform": host.platform,
-                "os_version": getattr(host, "os_version", None),
-                "location": getattr(host, "location", None),
-                **result.result
-            }
-            
-            collection_run_id = self.store_device_data(
-                hostname, 
-                {"hostname": host.hostname}, 
-                device_info
-            )
-            
-            if collection_run_id:
-                success_count += 1
-                total_routes += len(result.result.get("routes", []))
-            else:
-                failure_count += 1
+
+        # Persist devices in parallel: each store_device_data call gets
+        # its own session from the pool, so slow commits for one device
+        # no longer stall the rest.
+        store_futures = {}
+        route_counts = {}
+        failed_hosts = []
+
+        with ThreadPoolExecutor(max_workers=config.db_workers) as executor:
+            for hostname, result in results.items():
+                host = self.nr.inventory.hosts[hostname]
+
+                if result.failed:
+                    failure_count += 1
+                    self.logger.error("Collection failed",
+                                    hostname=hostname,
+                                    error=str(result.exception))
+                    failed_hosts.append((hostname, str(result.exception)))
+                    continue
+
+                # Store successful results
+                device_info = {
+                    "vendor": getattr(host, "vendor", "unknown"),
+                    "platform": host.platform,
+                    "os_version": getattr(host, "os_version", None),
+                    "location": getattr(host, "location", None),
+                    **result.result
+                }
+
+                route_counts[hostname] = len(result.result.get("routes", []))
+                future = executor.submit(
+                    self.store_device_data,
+                    hostname,
+                    {"hostname": host.hostname},
+                    device_info
+                )
+                store_futures[future] = hostname
+
+            for future in as_completed(store_futures):
+                hostname = store_futures[future]
+                # A store worker raising must not abort the summary
+                # loop for the remaining devices; count it as failed.
+                try:
+                    stored = future.result()
+                except Exception as e:
+                    stored = None
+                    self.logger.error("Storing device data raised",
+                                    hostname=hostname, error=str(e))
+                if stored:
+                    success_count += 1
+                    total_routes += route_counts[hostname]
+                else:
+                    failure_count += 1
+
+        if failed_hosts:
+            self._store_failed_runs(failed_hosts)
         
         elapsed_time = time.time() - start_time
         
@@ -321,7 +683,7 @@ class RouteTableCollector:
             return False
         
         # Filter to specific host
-        device_nr = self.nr.filter(F(name=hostname))
+        device_nr = self.nr.filter(self._host_filters[hostname])
         results = device_nr.run(task=self.collect_device_info)
         
         result = results[hostname]
@@ -1,5 +1,6 @@
 """Ultra-simple configuration using only Python standard library."""
 import os
+from functools import lru_cache
 from typing import Optional
 
 
@@ -13,10 +14,14 @@ class SimpleConfig:
         self.db_name = os.getenv("DB_NAME", "routing_tables")
         self.db_user = os.getenv("DB_USER", "postgres")
         self.db_password = os.getenv("DB_PASSWORD", "postgres")
+        # "queue" keeps SQLAlchemy's in-process QueuePool; "null" hands
+        # pooling to an external pgbouncer in transaction mode.
+        self.db_pool_mode = os.getenv("DB_POOL_MODE", "queue").lower()
         
         # Collection settings
         self.collection_interval = int(os.getenv("COLLECTION_INTERVAL", "3600"))
         self.max_workers = int(os.getenv("MAX_WORKERS", "10"))
+        self.db_workers = int(os.getenv("DB_WORKERS", "4"))
         self.timeout = int(os.getenv("TIMEOUT", "60"))
         
         # Nornir inventory paths
@@ -44,5 +49,11 @@ class SimpleConfig:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
 
+@lru_cache(maxsize=1)
+def get_config() -> SimpleConfig:
+    """Return the process-wide configuration, reading the environment once."""
+    return SimpleConfig()
+
+
 # Global configuration instance
-config = SimpleConfig()
\ No newline at end of file
+config = get_config()
\ No newline at end of file
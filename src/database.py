@@ -1,9 +1,10 @@
 """Database connection and session management."""
+import orjson
 import structlog
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool, QueuePool
 from .config import config
 from .models import Base
 
@@ -25,14 +26,31 @@ class DatabaseManager:
         
         logger.info("Initializing database connection", database_url=config.database_url)
         
-        # Create engine with connection pooling
+        # Create engine with connection pooling. The psycopg2
+        # fast-execution flags rewrite Core executemany calls (route and
+        # failed-run batches) into paged multi-VALUES statements instead
+        # of one INSERT round-trip per row. With DB_POOL_MODE=null the
+        # in-process pool is disabled so an external pgbouncer in
+        # transaction mode owns the connections instead of this process
+        # holding up to pool_size+max_overflow of them.
+        if config.db_pool_mode == "null":
+            pool_kwargs = {"poolclass": NullPool}
+        else:
+            pool_kwargs = {
+                "poolclass": QueuePool,
+                "pool_size": 20,
+                "max_overflow": 30,
+                "pool_recycle": 3600,
+            }
+
         self.engine = create_engine(
             config.database_url,
-            poolclass=QueuePool,
-            pool_size=20,
-            max_overflow=30,
             pool_pre_ping=True,
-            pool_recycle=3600,
+            **pool_kwargs,
+            executemany_mode="values_plus_batch",
+            executemany_values_page_size=10000,
+            json_serializer=lambda value: orjson.dumps(value).decode(),
+            json_deserializer=orjson.loads,
             echo=config.log_level == "DEBUG"
         )
         
@@ -53,6 +71,122 @@ class DatabaseManager:
         
         logger.info("Creating database tables")
         Base.metadata.create_all(bind=self.engine)
+
+        # Post-create DDL: a trigram GIN index so contains-style hostname
+        # searches (explicit % wildcards in the CLI) can still use an
+        # index; the plain btree only serves anchored prefixes.
+        if self.engine.dialect.name == "postgresql":
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS idx_device_hostname_trgm "
+                        "ON devices USING gin (hostname gin_trgm_ops)"
+                    ))
+            except Exception as e:
+                logger.warning("Could not create trigram index", error=str(e))
+
+        # Identity-id migration for schemas that predate the switch
+        # from client-generated uuid primary keys on routes and
+        # change_logs: the bulk insert and COPY paths no longer send
+        # ids, which would hit NOT NULL violations there. Nothing
+        # references these surrogate ids, so the column is rebuilt as
+        # a server-generated identity bigint in place.
+        if self.engine.dialect.name == "postgresql":
+            try:
+                with self.engine.connect() as conn:
+                    for table in ("routes", "change_logs"):
+                        id_type = conn.execute(
+                            text(
+                                "SELECT data_type FROM information_schema.columns "
+                                "WHERE table_name = :table AND column_name = 'id'"
+                            ),
+                            {"table": table},
+                        ).scalar()
+                        if id_type == "uuid":
+                            conn.execute(text(
+                                f"ALTER TABLE {table} DROP COLUMN id"
+                            ))
+                            conn.execute(text(
+                                f"ALTER TABLE {table} ADD COLUMN id bigint "
+                                "GENERATED ALWAYS AS IDENTITY PRIMARY KEY"
+                            ))
+                            logger.info("Migrated id column to identity",
+                                        table=table)
+            except Exception as e:
+                logger.warning("Could not migrate identity id columns",
+                               error=str(e))
+
+        # Generated network column: the destination/prefix pair is
+        # combined once by the server on insert and read back by the
+        # CSV export's COPY query instead of concatenating the two
+        # columns per exported row. The GiST index an earlier version
+        # built on it served no query and is dropped.
+        if self.engine.dialect.name == "postgresql":
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text(
+                        "ALTER TABLE routes ADD COLUMN IF NOT EXISTS network inet "
+                        "GENERATED ALWAYS AS (set_masklen(destination, prefix_length)) STORED"
+                    ))
+                    conn.execute(text(
+                        "DROP INDEX IF EXISTS idx_route_network_gist"
+                    ))
+                    # create_all never adds indexes to pre-existing
+                    # tables, so build the composite run-key index
+                    # here before dropping the BRIN it supersedes —
+                    # otherwise an upgraded schema would lose its only
+                    # per-run routes index.
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_route_run_key "
+                        "ON routes (collection_run_id, destination, "
+                        "prefix_length, vrf_id)"
+                    ))
+                    conn.execute(text(
+                        "DROP INDEX IF EXISTS ix_route_collection"
+                    ))
+            except Exception as e:
+                logger.warning("Could not create generated network column", error=str(e))
+
+        # Drop the generated route_hash column if an earlier version
+        # created it: change detection diffs runs with EXCEPT over the
+        # raw signature columns, so the hash was computed on every
+        # route insert but never read.
+        if self.engine.dialect.name == "postgresql":
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text(
+                        "ALTER TABLE routes DROP COLUMN IF EXISTS route_hash"
+                    ))
+            except Exception as e:
+                logger.warning("Could not drop route hash column", error=str(e))
+
+        # Pending-runs partial index plus guards for schemas created
+        # before the digest and done-flag columns existed (create_all
+        # does not alter existing tables, and every full-entity
+        # CollectionRun query would hit UndefinedColumn without them).
+        # The detection sweep then scans only the handful of
+        # unprocessed runs instead of every completed run in the
+        # retention window.
+        if self.engine.dialect.name == "postgresql":
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text(
+                        "ALTER TABLE collection_runs ADD COLUMN IF NOT EXISTS "
+                        "output_digest bytea"
+                    ))
+                    conn.execute(text(
+                        "ALTER TABLE collection_runs ADD COLUMN IF NOT EXISTS "
+                        "change_detection_done boolean NOT NULL DEFAULT false"
+                    ))
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS idx_run_pending "
+                        "ON collection_runs (completed_at) "
+                        "WHERE change_detection_done = false"
+                    ))
+            except Exception as e:
+                logger.warning("Could not create pending-run index", error=str(e))
+
         logger.info("Database tables created successfully")
     
     @contextmanager
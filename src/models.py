@@ -1,14 +1,14 @@
 """Database models for routing table storage."""
-import uuid
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, Text, 
-    ForeignKey, Index, Float, JSON, UniqueConstraint
+    BigInteger, Column, String, Integer, DateTime, Boolean, Text,
+    ForeignKey, Identity, Index, Float, JSON, LargeBinary, UniqueConstraint
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, INET
+from uuid6 import uuid7
 
 Base = declarative_base()
 
@@ -18,7 +18,7 @@ class Device(Base):
     
     __tablename__ = "devices"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     hostname = Column(String(255), unique=True, nullable=False, index=True)
     ip_address = Column(INET, nullable=False)
     vendor = Column(String(50), nullable=False)
@@ -43,7 +43,7 @@ class VRF(Base):
     
     __tablename__ = "vrfs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     device_id = Column(UUID(as_uuid=True), ForeignKey("devices.id"), nullable=False)
     name = Column(String(255), nullable=False)
     rd = Column(String(100), nullable=True)  # Route Distinguisher
@@ -55,10 +55,11 @@ class VRF(Base):
     device = relationship("Device", back_populates="vrfs")
     routes = relationship("Route", back_populates="vrf", cascade="all, delete-orphan")
     
-    # Constraints
+    # Constraints. uq_device_vrf's unique index also serves the
+    # (device_id, name) lookups in store_device_data, so no separate
+    # index is kept on the same columns.
     __table_args__ = (
         UniqueConstraint("device_id", "name", name="uq_device_vrf"),
-        Index("ix_vrf_device_name", "device_id", "name"),
     )
     
     def __repr__(self):
@@ -69,8 +70,11 @@ class Route(Base):
     """Route model for storing individual route entries."""
     
     __tablename__ = "routes"
-    
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Route ids never leave this system, so a 8-byte identity beats a
+    # 16-byte UUID on the hottest table: half the key bytes in the
+    # primary index and no per-row id generation in Python.
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
     vrf_id = Column(UUID(as_uuid=True), ForeignKey("vrfs.id"), nullable=False)
     collection_run_id = Column(UUID(as_uuid=True), ForeignKey("collection_runs.id"), nullable=False)
     
@@ -97,11 +101,17 @@ class Route(Base):
     vrf = relationship("VRF", back_populates="routes")
     collection_run = relationship("CollectionRun", back_populates="routes")
     
-    # Constraints and indexes
+    # Constraints and indexes.
     __table_args__ = (
         Index("ix_route_destination", "destination", "prefix_length"),
         Index("ix_route_vrf_protocol", "vrf_id", "protocol"),
-        Index("ix_route_collection", "collection_run_id"),
+        # Covers the change-detection queries: filter by run, then
+        # EXCEPT/self-join on the route key. With the key columns
+        # already ordered per run the planner can merge-join two runs
+        # without sorting either side; the leading column also serves
+        # every plain per-run lookup.
+        Index("ix_route_run_key", "collection_run_id", "destination",
+              "prefix_length", "vrf_id"),
     )
     
     @property
@@ -118,7 +128,7 @@ class CollectionRun(Base):
     
     __tablename__ = "collection_runs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     device_id = Column(UUID(as_uuid=True), ForeignKey("devices.id"), nullable=False)
     
     # Run information
@@ -126,16 +136,21 @@ class CollectionRun(Base):
     completed_at = Column(DateTime, nullable=True)
     status = Column(String(20), nullable=False, default="running")  # running, completed, failed
     error_message = Column(Text, nullable=True)
+    output_digest = Column(LargeBinary, nullable=True)  # SHA-256 of raw command output
     
     # Statistics
     total_routes = Column(Integer, default=0)
     total_vrfs = Column(Integer, default=0)
     processing_time = Column(Float, nullable=True)  # seconds
     
-    # Change detection
+    # Change detection. The explicit done flag exists because the
+    # change counts cannot double as a "not processed yet" marker: a
+    # run whose table genuinely did not change would look unprocessed
+    # forever.
     routes_added = Column(Integer, default=0)
     routes_removed = Column(Integer, default=0)
     routes_modified = Column(Integer, default=0)
+    change_detection_done = Column(Boolean, nullable=False, default=False)
     
     # Relationships
     device = relationship("Device", back_populates="collection_runs")
@@ -145,6 +160,8 @@ class CollectionRun(Base):
     __table_args__ = (
         Index("ix_collection_run_device_status", "device_id", "status"),
         Index("ix_collection_run_started", "started_at"),
+        Index("ix_collection_run_latest", "device_id", "status", "completed_at"),
+        Index("ix_collection_run_status_completed", "status", "completed_at", "device_id"),
     )
     
     @property
@@ -162,8 +179,8 @@ class ChangeLog(Base):
     """Change log model for tracking routing table changes."""
     
     __tablename__ = "change_logs"
-    
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
     device_id = Column(UUID(as_uuid=True), ForeignKey("devices.id"), nullable=False)
     vrf_name = Column(String(255), nullable=False)
     
@@ -1,7 +1,40 @@
 """Route table parsers for different vendors."""
+from functools import lru_cache
+from typing import Optional
+
 from .base import BaseParser
 from .cisco import CiscoParser
 from .juniper import JuniperParser
 from .huawei import HuaweiParser
 
-__all__ = ["BaseParser", "CiscoParser", "JuniperParser", "HuaweiParser"]
\ No newline at end of file
+_PARSER_CLASSES = {
+    "cisco": CiscoParser,
+    "juniper": JuniperParser,
+    "huawei": HuaweiParser,
+}
+
+# Platform names that map onto a vendor parser.
+_VENDOR_ALIASES = {
+    "ios": "cisco",
+    "iosxe": "cisco",
+    "iosxr": "cisco",
+    "nxos": "cisco",
+    "junos": "juniper",
+    "vrp": "huawei",
+}
+
+
+@lru_cache(maxsize=None)
+def get_parser(vendor: str) -> Optional[BaseParser]:
+    """Return the shared parser instance for a vendor or platform name.
+
+    Parsers are stateless, so one instance per vendor is cached and
+    reused instead of constructing a parser per device.
+    """
+    vendor = vendor.lower()
+    cls = _PARSER_CLASSES.get(_VENDOR_ALIASES.get(vendor, vendor))
+    return cls() if cls else None
+
+
+__all__ = ["BaseParser", "CiscoParser", "JuniperParser", "HuaweiParser",
+           "get_parser"]
@@ -2,37 +2,176 @@
 import re
 import ipaddress
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Compiled once; clean_output runs per command output and parse loops
+# call normalize_protocol per route, so neither should pay re.compile
+# or dict-literal allocation per call.
+# One alternation handles both ANSI escapes and trailing whitespace so
+# clean_output makes a single pass over the buffer.
+CLEAN_OUTPUT_RE = re.compile(
+    r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])|[ \t\r]+$', re.MULTILINE
+)
+TRAILING_WS_RE = re.compile(r'[ \t\r]+$', re.MULTILINE)
+
+# Set-bit counts for every octet value, so dotted-mask conversion is
+# four table lookups instead of int/bin/str.count per octet per route.
+_POPCOUNT = bytes(bin(i).count('1') for i in range(256))
+
+_COMMUNITY_RE = re.compile(r'\S+:\S+', re.ASCII)
+
+# Line tokenizer for the parse loops: trims surrounding whitespace
+# inside the regex engine while splitting, so iterating output costs
+# one match object per line instead of a materialized line list plus a
+# Python-level str.strip call each.
+_LINE_RE = re.compile(r'[ \t]*([^\n]*?)[ \t\r]*(?:\n|$)')
+
+_PROTOCOL_MAP = {
+    "B": "BGP",
+    "O": "OSPF",
+    "S": "STATIC",
+    "C": "CONNECTED",
+    "L": "LOCAL",
+    "R": "RIP",
+    "E": "EIGRP",
+    "I": "ISIS",
+    "IA": "OSPF_IA",
+    "E1": "OSPF_E1",
+    "E2": "OSPF_E2",
+    "N1": "OSPF_NSSA_E1",
+    "N2": "OSPF_NSSA_E2",
+}
+
+
+@lru_cache(maxsize=65536)
+def parse_network(network_str: str) -> Tuple[str, int]:
+    """Parse network string into IP and prefix length.
+
+    Memoized at module level: routing tables repeat the same network
+    strings heavily across VRFs and collection runs, so repeats cost a
+    dict hit instead of a re-parse.
+    """
+    try:
+        if "/" in network_str:
+            ip, prefix_len = network_str.split("/")
+            return ip.strip(), int(prefix_len)
+        else:
+            # Handle subnet mask notation
+            parts = network_str.split()
+            if len(parts) >= 2:
+                ip = parts[0]
+                mask = parts[1]
+                # Convert subnet mask to prefix length
+                o = mask.split('.')
+                prefix_len = (_POPCOUNT[int(o[0])] + _POPCOUNT[int(o[1])] +
+                              _POPCOUNT[int(o[2])] + _POPCOUNT[int(o[3])])
+                return ip, prefix_len
+            else:
+                # Assume /32 for host routes
+                return network_str.strip(), 32
+    except Exception as e:
+        logger.warning("Failed to parse network", network=network_str, error=str(e))
+        return network_str.strip(), 32
+
+
+def maybe_int(value: Optional[str], _int=int) -> Optional[int]:
+    """Convert a numeric field to int, or None when absent or non-numeric.
+
+    One try/except walk instead of the isdigit-then-int idiom, which
+    scans the string twice per field; int is bound as a default arg to
+    keep the lookup local in hot loops.
+    """
+    try:
+        return _int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=65536)
+def validate_ip_address(ip_str: str) -> bool:
+    """Validate if string is a valid IP address.
+
+    Memoized: next-hop addresses recur constantly, and ipaddress is
+    pure Python, so the cache saves a full parse per repeat.
+    """
+    try:
+        ipaddress.ip_address(ip_str)
+        return True
+    except ValueError:
+        return False
+
 
-@dataclass
 class ParsedRoute:
-    """Represents a parsed route entry."""
-    destination: str
-    prefix_length: int
-    next_hop: Optional[str]
-    protocol: str
-    metric: Optional[int] = None
-    admin_distance: Optional[int] = None
-    interface: Optional[str] = None
-    as_path: Optional[str] = None
-    local_preference: Optional[int] = None
-    med: Optional[int] = None
-    communities: Optional[List[str]] = None
-    route_type: Optional[str] = None
-    vrf: str = "default"
-
-
-@dataclass
+    """Represents a parsed route entry.
+
+    A plain __slots__ class rather than a dataclass: parsers build one
+    instance per route and large tables run to the hundreds of
+    thousands, so dropping the per-instance __dict__ roughly halves
+    memory (dataclass slots=True needs Python 3.10, and the Cisco
+    parser mutates entries while folding continuation lines, so frozen
+    is out).
+    """
+
+    __slots__ = (
+        "destination", "prefix_length", "next_hop", "protocol",
+        "metric", "admin_distance", "interface", "as_path",
+        "local_preference", "med", "communities", "route_type", "vrf",
+    )
+
+    # protocol precedes next_hop so next_hop can default to None:
+    # connected/local routes have no next hop, and every call site
+    # passes keywords anyway.
+    def __init__(self,
+                 destination: str,
+                 prefix_length: int,
+                 protocol: str,
+                 next_hop: Optional[str] = None,
+                 metric: Optional[int] = None,
+                 admin_distance: Optional[int] = None,
+                 interface: Optional[str] = None,
+                 as_path: Optional[str] = None,
+                 local_preference: Optional[int] = None,
+                 med: Optional[int] = None,
+                 communities: Optional[List[str]] = None,
+                 route_type: Optional[str] = None,
+                 vrf: str = "default"):
+        self.destination = destination
+        self.prefix_length = prefix_length
+        self.next_hop = next_hop
+        self.protocol = protocol
+        self.metric = metric
+        self.admin_distance = admin_distance
+        self.interface = interface
+        self.as_path = as_path
+        self.local_preference = local_preference
+        self.med = med
+        self.communities = communities
+        self.route_type = route_type
+        self.vrf = vrf
+
+    def __repr__(self):
+        return (f"ParsedRoute(destination='{self.destination}', "
+                f"prefix_length={self.prefix_length}, "
+                f"protocol='{self.protocol}', vrf='{self.vrf}')")
+
+
 class VRFInfo:
     """Represents VRF information."""
-    name: str
-    rd: Optional[str] = None
-    description: Optional[str] = None
+
+    __slots__ = ("name", "rd", "description")
+
+    def __init__(self, name: str, rd: Optional[str] = None,
+                 description: Optional[str] = None):
+        self.name = name
+        self.rd = rd
+        self.description = description
+
+    def __repr__(self):
+        return f"VRFInfo(name='{self.name}', rd='{self.rd}')"
 
 
 class BaseParser(ABC):
@@ -64,72 +203,46 @@ class BaseParser(ABC):
     
     def normalize_protocol(self, protocol: str) -> str:
         """Normalize protocol names across vendors."""
-        protocol_map = {
-            "B": "BGP",
-            "O": "OSPF",
-            "S": "STATIC",
-            "C": "CONNECTED",
-            "L": "LOCAL",
-            "R": "RIP",
-            "E": "EIGRP",
-            "i": "ISIS",
-            "IA": "OSPF_IA",
-            "E1": "OSPF_E1",
-            "E2": "OSPF_E2",
-            "N1": "OSPF_NSSA_E1",
-            "N2": "OSPF_NSSA_E2",
-        }
-        return protocol_map.get(protocol.upper(), protocol.upper())
+        # Device output emits the codes upper-cased already, so try the
+        # map before allocating a new string with .upper().
+        mapped = _PROTOCOL_MAP.get(protocol)
+        if mapped is not None:
+            return mapped
+        protocol = protocol.upper()
+        return _PROTOCOL_MAP.get(protocol, protocol)
     
     def parse_network(self, network_str: str) -> Tuple[str, int]:
         """Parse network string into IP and prefix length."""
-        try:
-            if "/" in network_str:
-                ip, prefix_len = network_str.split("/")
-                return ip.strip(), int(prefix_len)
-            else:
-                # Handle subnet mask notation
-                parts = network_str.split()
-                if len(parts) >= 2:
-                    ip = parts[0]
-                    mask = parts[1]
-                    # Convert subnet mask to prefix length
-                    prefix_len = sum([bin(int(x)).count('1') for x in mask.split('.')])
-                    return ip, prefix_len
-                else:
-                    # Assume /32 for host routes
-                    return network_str.strip(), 32
-        except Exception as e:
-            self.logger.warning("Failed to parse network", network=network_str, error=str(e))
-            return network_str.strip(), 32
-    
+        return parse_network(network_str)
+
     def validate_ip_address(self, ip_str: str) -> bool:
         """Validate if string is a valid IP address."""
-        try:
-            ipaddress.ip_address(ip_str)
-            return True
-        except ValueError:
-            return False
+        return validate_ip_address(ip_str)
     
     def clean_output(self, output: str) -> str:
         """Clean command output by removing ANSI codes and extra whitespace."""
-        # Remove ANSI escape sequences
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        cleaned = ansi_escape.sub('', output)
-        
-        # Remove extra whitespace
-        lines = [line.rstrip() for line in cleaned.split('\n')]
-        return '\n'.join(lines)
+        # str.__contains__ is a C memchr scan; most SSH output carries
+        # no ANSI escapes, so skip that alternation when none exist.
+        if '\x1b' not in output:
+            return TRAILING_WS_RE.sub('', output)
+        return CLEAN_OUTPUT_RE.sub('', output)
     
+    def iter_lines(self, output: str) -> Iterator[str]:
+        """Yield cleaned, stripped lines of command output lazily.
+
+        Large routing tables run to megabytes of text; yielding one
+        line at a time keeps peak memory at the raw buffer instead of
+        buffer plus full line list. The tokenizer trims surrounding
+        whitespace itself, so the common escape-free case streams
+        straight off the raw output without making a cleaned copy.
+        """
+        if '\x1b' in output:
+            output = CLEAN_OUTPUT_RE.sub('', output)
+        for match in _LINE_RE.finditer(output):
+            yield match.group(1)
+
     def extract_communities(self, community_str: str) -> List[str]:
         """Extract BGP communities from string."""
         if not community_str:
             return []
-        
-        # Handle different community formats
-        communities = []
-        for comm in community_str.split():
-            if ":" in comm:
-                communities.append(comm)
-        
-        return communities
\ No newline at end of file
+        return _COMMUNITY_RE.findall(community_str)
\ No newline at end of file
@@ -3,6 +3,38 @@ import re
 from typing import List, Optional
 from .base import BaseParser, ParsedRoute, VRFInfo
 
+# Row patterns compiled once at import. The parse methods run per VRF
+# per device, so compiling inside them (or calling re.search with a
+# string literal) pays the re._compile cache lookup on every call.
+#
+# One alternation covers both route shapes so each line is classified
+# in a single C-level match instead of a Python loop over alternative
+# patterns (the old separate static pattern was a strict subset of the
+# standard one and is folded in here).
+_ROUTE_UNION_RE = re.compile(
+    # Standard format: B    10.1.1.0/24 [200/0] via 192.168.1.1
+    r'^(?:(?P<proto>[BOSCLERIAD*]+\*?)\s+(?P<net>\S+)\s+'
+    r'\[(?P<ad>\d+)/(?P<metric>\d+)\]\s+via\s+(?P<nh>[^\s,]+)'
+    r'(?:\s+\d+:\d+:\d+)?(?:,\s+(?P<iface>\S+))?'
+    # Connected: C    192.168.1.0/24 is directly connected, GigabitEthernet0/0
+    r'|(?P<cproto>[CL])\s+(?P<cnet>\S+)\s+is\s+directly\s+connected,\s+(?P<ciface>\S+))',
+    re.ASCII
+)
+
+# First characters a route line can start with. Header, legend and
+# noise lines ("Codes:", "Gateway of last resort...") are rejected by
+# this set membership test without ever invoking the regex.
+_ROUTE_LEAD_CHARS = frozenset('BOSCLERIAD*')
+
+# Additional next hop continuation: [200/0] via 192.168.1.2
+_VIA_CONTINUATION_RE = re.compile(r'\[(\d+)/(\d+)\]\s+via\s+([^\s,]+)', re.ASCII)
+
+# Characters that make up the status column of a BGP table row.
+# Rows are tokenized with str.split instead of a regex: the old
+# pattern's greedy (.+) AS-path group backtracked heavily on long
+# paths, while whitespace splitting is a single C pass.
+_BGP_STATUS_CHARS = frozenset('*>sd')
+
 
 class CiscoParser(BaseParser):
     """Parser for Cisco IOS/IOS-XE/IOS-XR routing tables."""
@@ -25,13 +57,9 @@ class CiscoParser(BaseParser):
         """Parse VRF list output."""
         vrfs = [VRFInfo(name="default")]  # Always include default VRF
         
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
         # Skip header lines
         data_started = False
-        for line in lines:
-            line = line.strip()
+        for line in self.iter_lines(output):
             if not line or line.startswith("Name"):
                 if "Name" in line:
                     data_started = True
@@ -53,72 +81,70 @@ class CiscoParser(BaseParser):
     def parse_routing_table(self, output: str, vrf: str = "default") -> List[ParsedRoute]:
         """Parse Cisco routing table output."""
         routes = []
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
-        # Patterns for different route types
-        route_patterns = [
-            # Standard format: B    10.1.1.0/24 [200/0] via 192.168.1.1
-            re.compile(r'^([BOSCLERIAD*]+[\*]?)\s+(\S+)\s+\[(\d+)/(\d+)\]\s+via\s+(\S+)(?:\s+\d+:\d+:\d+)?(?:,\s+(\S+))?'),
-            # Connected: C    192.168.1.0/24 is directly connected, GigabitEthernet0/0
-            re.compile(r'^([CL])\s+(\S+)\s+is\s+directly\s+connected,\s+(\S+)'),
-            # Static: S    10.0.0.0/8 [1/0] via 192.168.1.1
-            re.compile(r'^([S])\s+(\S+)\s+\[(\d+)/(\d+)\]\s+via\s+(\S+)'),
-        ]
-        
         current_route = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("Codes:") or line.startswith("Gateway"):
+
+        # Bind hot-loop callables locally; attribute lookups cost per
+        # access in CPython and this loop runs once per output line.
+        append_route = routes.append
+        parse_net = self.parse_network
+        norm_proto = self.normalize_protocol
+        match_route = _ROUTE_UNION_RE.match
+        search_via = _VIA_CONTINUATION_RE.search
+        new_route = ParsedRoute
+
+        for line in self.iter_lines(output):
+            if not line:
                 continue
-            
+
+            # Dispatch on the first character before paying for a regex
+            first = line[0]
+            if first not in _ROUTE_LEAD_CHARS and first != '[':
+                continue
+
             # Try to match route patterns
-            matched = False
-            for pattern in route_patterns:
-                match = pattern.match(line)
-                if match:
-                    matched = True
-                    groups = match.groups()
-                    
-                    if len(groups) >= 2:
-                        protocol_code = groups[0].replace('*', '').strip()
-                        network = groups[1]
-                        
-                        # Parse network
-                        try:
-                            destination, prefix_length = self.parse_network(network)
-                        except:
-                            continue
-                        
-                        # Create route object
-                        route = ParsedRoute(
-                            destination=destination,
-                            prefix_length=prefix_length,
-                            protocol=self.normalize_protocol(protocol_code),
-                            vrf=vrf
-                        )
-                        
-                        # Extract additional information based on pattern
-                        if len(groups) >= 5:  # Has AD/metric/next_hop
-                            route.admin_distance = int(groups[2]) if groups[2] else None
-                            route.metric = int(groups[3]) if groups[3] else None
-                            route.next_hop = groups[4] if groups[4] else None
-                            route.interface = groups[5] if len(groups) > 5 and groups[5] else None
-                        elif len(groups) >= 3:  # Connected route
-                            route.interface = groups[2] if groups[2] else None
-                        
-                        routes.append(route)
-                        current_route = route
-                    break
-            
+            match = match_route(line) if first != '[' else None
+            if match:
+                connected = match.group('cproto') is not None
+                if connected:
+                    protocol_code = match.group('cproto')
+                    network = match.group('cnet')
+                else:
+                    protocol_code = match.group('proto').replace('*', '').strip()
+                    network = match.group('net')
+
+                # Parse network
+                try:
+                    destination, prefix_length = parse_net(network)
+                except:
+                    continue
+
+                # Create route object
+                route = new_route(
+                    destination=destination,
+                    prefix_length=prefix_length,
+                    protocol=norm_proto(protocol_code),
+                    vrf=vrf
+                )
+
+                # Extract additional information based on matched branch
+                if connected:
+                    route.interface = match.group('ciface')
+                else:
+                    route.admin_distance = int(match.group('ad'))
+                    route.metric = int(match.group('metric'))
+                    route.next_hop = match.group('nh')
+                    route.interface = match.group('iface')
+
+                append_route(route)
+                current_route = route
+
             # Handle continuation lines (multiple next hops)
-            if not matched and current_route and line.startswith('['):
+            elif current_route and first == '[':
                 # Additional next hop: [200/0] via 192.168.1.2
-                via_match = re.search(r'\[(\d+)/(\d+)\]\s+via\s+(\S+)', line)
+                via_match = search_via(line)
                 if via_match:
                     # Create additional route entry for load balancing
-                    additional_route = ParsedRoute(
+                    additional_route = new_route(
                         destination=current_route.destination,
                         prefix_length=current_route.prefix_length,
                         protocol=current_route.protocol,
@@ -127,7 +153,7 @@ class CiscoParser(BaseParser):
                         next_hop=via_match.group(3),
                         vrf=vrf
                     )
-                    routes.append(additional_route)
+                    append_route(additional_route)
         
         self.logger.info("Parsed routing table", vrf=vrf, route_count=len(routes))
         return routes
@@ -142,52 +168,56 @@ class CiscoParser(BaseParser):
     def parse_bgp_table(self, output: str, vrf: str = "default") -> List[ParsedRoute]:
         """Parse BGP table for detailed BGP attributes."""
         routes = []
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
-        # BGP table pattern: *> 10.1.1.0/24    192.168.1.1    0    100    0 65001 i
-        bgp_pattern = re.compile(
-            r'^([*>sd\s]+)\s+(\S+)\s+(\S+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(.+)\s+([ie?])\s*$'
-        )
-        
-        for line in lines:
-            line = line.strip()
+        append_route = routes.append
+        parse_net = self.parse_network
+        new_route = ParsedRoute
+
+        for line in self.iter_lines(output):
             if not line or line.startswith("BGP") or line.startswith("Network"):
                 continue
-            
-            match = bgp_pattern.match(line)
-            if match:
-                status = match.group(1).strip()
-                network = match.group(2)
-                next_hop = match.group(3)
-                metric = match.group(4)
-                local_pref = match.group(5)
-                weight = match.group(6)
-                as_path = match.group(7).strip()
-                origin = match.group(8)
-                
-                try:
-                    destination, prefix_length = self.parse_network(network)
-                except:
-                    continue
-                
-                route = ParsedRoute(
-                    destination=destination,
-                    prefix_length=prefix_length,
-                    next_hop=next_hop if next_hop != "0.0.0.0" else None,
-                    protocol="BGP",
-                    metric=int(metric) if metric.isdigit() else None,
-                    local_preference=int(local_pref) if local_pref.isdigit() else None,
-                    as_path=as_path,
-                    vrf=vrf
-                )
-                
-                # Determine route type from status
-                if ">" in status:
-                    route.route_type = "best"
-                elif "*" in status:
-                    route.route_type = "valid"
-                
-                routes.append(route)
+
+            # BGP table row: *> 10.1.1.0/24    192.168.1.1    0    100    0 65001 i
+            toks = line.split()
+            if len(toks) < 8 or toks[-1] not in ('i', 'e', '?'):
+                continue
+
+            # Leading tokens made purely of status flags form the
+            # status column; everything between the numeric triple and
+            # the origin code is the AS path.
+            i = 0
+            while i < len(toks) and all(c in _BGP_STATUS_CHARS for c in toks[i]):
+                i += 1
+            if i == 0 or len(toks) - i < 7:
+                continue
+
+            status = ''.join(toks[:i])
+            network, next_hop, metric, local_pref, weight = toks[i:i + 5]
+            if not (metric.isdigit() and local_pref.isdigit() and weight.isdigit()):
+                continue
+            as_path = ' '.join(toks[i + 5:-1])
+
+            try:
+                destination, prefix_length = parse_net(network)
+            except:
+                continue
+
+            route = new_route(
+                destination=destination,
+                prefix_length=prefix_length,
+                next_hop=next_hop if next_hop != "0.0.0.0" else None,
+                protocol="BGP",
+                metric=int(metric),
+                local_preference=int(local_pref),
+                as_path=as_path,
+                vrf=vrf
+            )
+
+            # Determine route type from status
+            if ">" in status:
+                route.route_type = "best"
+            elif "*" in status:
+                route.route_type = "valid"
+
+            append_route(route)
         
         return routes
\ No newline at end of file
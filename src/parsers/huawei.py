@@ -1,7 +1,48 @@
 """Huawei route table parser."""
 import re
 from typing import List, Optional
-from .base import BaseParser, ParsedRoute, VRFInfo
+from .base import BaseParser, ParsedRoute, VRFInfo, maybe_int
+from .base import _PROTOCOL_MAP as _BASE_PROTOCOL_MAP
+
+# Merged protocol map built once at import: the base-class codes plus
+# the VRP-specific ones, so normalize_protocol is a single dict lookup
+# instead of rebuilding a dict literal and chaining to super() per
+# route.
+_HUAWEI_PROTOCOL_MAP = dict(_BASE_PROTOCOL_MAP)
+_HUAWEI_PROTOCOL_MAP.update({
+    "D": "DIRECT",
+    "U": "USER",
+    "O_INTRA": "OSPF_INTRA",
+    "O_INTER": "OSPF_INTER",
+    "O_ASE": "OSPF_ASE",
+    "O_NSSA": "OSPF_NSSA",
+})
+
+# Row patterns compiled once at import rather than per parse call.
+# Standard: B       10.1.1.0/24         192.168.1.1         UG    100     0       GE0/0/1
+_ROUTE_RE = re.compile(
+    r'^([BOSCLED\*\s]+)\s+(\S+)\s+(\S+)\s+([A-Z]+)\s+(\d+)\s+(\d+)\s+(\S+)',
+    re.ASCII
+)
+# Connected: C       192.168.1.0/24         0.0.0.0             U     0       0       GE0/0/1
+_CONNECTED_RE = re.compile(
+    r'^([CL])\s+(\S+)\s+(\S+)\s+([A-Z]+)\s+(\d+)\s+(\d+)\s+(\S+)',
+    re.ASCII
+)
+# Characters that make up the status column of a BGP table row.
+# Rows are tokenized with str.split instead of a regex: the old
+# pattern's greedy (.+) AS-path group backtracked heavily on long
+# paths, while whitespace splitting is a single C pass.
+_BGP_STATUS_CHARS = frozenset('*>di')
+
+# First characters a route line can start with; header and divider
+# lines are rejected by this membership test before any regex runs.
+_ROUTE_LEAD_CHARS = frozenset('BOSCLED*')
+
+# Header lines, matched with one anchored alternation instead of a
+# Python-level substring scan per header candidate.
+_HEADER_RE = re.compile(r'^(?:Route Flags:|Destination|---|Proto)')
+_BGP_HEADER_RE = re.compile(r'^(?:BGP|Network|Total)')
 
 
 class HuaweiParser(BaseParser):
@@ -25,13 +66,9 @@ class HuaweiParser(BaseParser):
         """Parse VRF list output."""
         vrfs = [VRFInfo(name="default")]  # Always include default VRF
         
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
         # Skip header lines and find data
         data_started = False
-        for line in lines:
-            line = line.strip()
+        for line in self.iter_lines(output):
             if not line:
                 continue
             
@@ -56,28 +93,24 @@ class HuaweiParser(BaseParser):
     def parse_routing_table(self, output: str, vrf: str = "default") -> List[ParsedRoute]:
         """Parse Huawei routing table output."""
         routes = []
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
-        # Patterns for different route formats
-        # Standard: B       10.1.1.0/24         192.168.1.1         UG    100     0       GE0/0/1
-        route_pattern = re.compile(
-            r'^([BOSCLED\*\s]+)\s+(\S+)\s+(\S+)\s+([A-Z]+)\s+(\d+)\s+(\d+)\s+(\S+)'
-        )
-        
-        # Connected: C       192.168.1.0/24         0.0.0.0             U     0       0       GE0/0/1
-        connected_pattern = re.compile(
-            r'^([CL])\s+(\S+)\s+(\S+)\s+([A-Z]+)\s+(\d+)\s+(\d+)\s+(\S+)'
-        )
-        
-        for line in lines:
-            line = line.strip()
-            if not line or any(header in line for header in 
-                             ["Route Flags:", "Destination", "---", "Proto"]):
+
+        # Bind hot-loop callables locally; attribute lookups cost per
+        # access in CPython and this loop runs once per output line.
+        append_route = routes.append
+        parse_net = self.parse_network
+        norm_proto = self.normalize_protocol
+        match_route = _ROUTE_RE.match
+        match_connected = _CONNECTED_RE.match
+        new_route = ParsedRoute
+
+        for line in self.iter_lines(output):
+            if not line or line[0] not in _ROUTE_LEAD_CHARS:
                 continue
-            
+            if _HEADER_RE.match(line):
+                continue
+
             # Try to match route patterns
-            match = route_pattern.match(line) or connected_pattern.match(line)
+            match = match_route(line) or match_connected(line)
             if match:
                 protocol_code = match.group(1).strip()
                 network = match.group(2)
@@ -89,51 +122,39 @@ class HuaweiParser(BaseParser):
                 
                 # Parse network
                 try:
-                    destination, prefix_length = self.parse_network(network)
+                    destination, prefix_length = parse_net(network)
                 except:
                     continue
-                
+
                 # Skip invalid next hops
                 if next_hop == "0.0.0.0" or not self.validate_ip_address(next_hop):
                     next_hop = None
-                
-                route = ParsedRoute(
+
+                route = new_route(
                     destination=destination,
                     prefix_length=prefix_length,
                     next_hop=next_hop,
-                    protocol=self.normalize_protocol(protocol_code),
-                    admin_distance=int(preference) if preference.isdigit() else None,
-                    metric=int(cost) if cost.isdigit() else None,
+                    protocol=norm_proto(protocol_code),
+                    admin_distance=maybe_int(preference),
+                    metric=maybe_int(cost),
                     interface=interface if interface != "NULL0" else None,
                     vrf=vrf
                 )
-                
-                routes.append(route)
+
+                append_route(route)
         
         self.logger.info("Parsed routing table", vrf=vrf, route_count=len(routes))
         return routes
     
     def normalize_protocol(self, protocol: str) -> str:
         """Normalize Huawei protocol names."""
-        huawei_protocol_map = {
-            "B": "BGP",
-            "O": "OSPF",
-            "S": "STATIC",
-            "C": "CONNECTED",
-            "D": "DIRECT",
-            "L": "LOCAL",
-            "R": "RIP",
-            "I": "ISIS",
-            "U": "USER",
-            "O_INTRA": "OSPF_INTRA",
-            "O_INTER": "OSPF_INTER",
-            "O_ASE": "OSPF_ASE",
-            "O_NSSA": "OSPF_NSSA",
-        }
-        
-        # Use base class normalization first, then Huawei-specific
-        normalized = super().normalize_protocol(protocol)
-        return huawei_protocol_map.get(protocol.upper(), normalized)
+        # VRP emits the codes upper-cased already, so try the merged
+        # map before allocating a new string with .upper().
+        mapped = _HUAWEI_PROTOCOL_MAP.get(protocol)
+        if mapped is not None:
+            return mapped
+        protocol = protocol.upper()
+        return _HUAWEI_PROTOCOL_MAP.get(protocol, protocol)
     
     def get_bgp_table_command(self, vrf: str = "default") -> str:
         """Get command to retrieve BGP table."""
@@ -145,55 +166,58 @@ class HuaweiParser(BaseParser):
     def parse_bgp_table(self, output: str, vrf: str = "default") -> List[ParsedRoute]:
         """Parse BGP routing table for detailed BGP attributes."""
         routes = []
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
-        # BGP table pattern for Huawei
-        # *>i 10.1.1.0/24        192.168.1.1      100    0    65001 i
-        bgp_pattern = re.compile(
-            r'^([*>di\s]+)\s+(\S+)\s+(\S+)\s+(\d+)\s+(\d+)\s+(.+)\s+([ie])\s*$'
-        )
-        
-        for line in lines:
-            line = line.strip()
-            if not line or any(header in line for header in 
-                             ["BGP", "Network", "Total"]):
+        append_route = routes.append
+        parse_net = self.parse_network
+        new_route = ParsedRoute
+
+        for line in self.iter_lines(output):
+            if not line or _BGP_HEADER_RE.match(line):
                 continue
             
-            match = bgp_pattern.match(line)
-            if match:
-                status = match.group(1).strip()
-                network = match.group(2)
-                next_hop = match.group(3)
-                local_pref = match.group(4)
-                med = match.group(5)
-                as_path = match.group(6).strip()
-                origin = match.group(7)
-                
-                try:
-                    destination, prefix_length = self.parse_network(network)
-                except:
-                    continue
-                
-                route = ParsedRoute(
-                    destination=destination,
-                    prefix_length=prefix_length,
-                    next_hop=next_hop if next_hop != "0.0.0.0" else None,
-                    protocol="BGP",
-                    local_preference=int(local_pref) if local_pref.isdigit() else None,
-                    med=int(med) if med.isdigit() else None,
-                    as_path=as_path,
-                    vrf=vrf
-                )
-                
-                # Determine route type from status
-                if ">" in status:
-                    route.route_type = "best"
-                elif "*" in status:
-                    route.route_type = "valid"
-                elif "i" in status:
-                    route.route_type = "internal"
-                
-                routes.append(route)
+            # BGP table row: *>i 10.1.1.0/24        192.168.1.1      100    0    65001 i
+            toks = line.split()
+            if len(toks) < 7 or toks[-1] not in ('i', 'e'):
+                continue
+
+            # Leading tokens made purely of status flags form the
+            # status column; everything between the numeric pair and
+            # the origin code is the AS path.
+            i = 0
+            while i < len(toks) and all(c in _BGP_STATUS_CHARS for c in toks[i]):
+                i += 1
+            if i == 0 or len(toks) - i < 6:
+                continue
+
+            status = ''.join(toks[:i])
+            network, next_hop, local_pref, med = toks[i:i + 4]
+            if not (local_pref.isdigit() and med.isdigit()):
+                continue
+            as_path = ' '.join(toks[i + 4:-1])
+
+            try:
+                destination, prefix_length = parse_net(network)
+            except:
+                continue
+
+            route = new_route(
+                destination=destination,
+                prefix_length=prefix_length,
+                next_hop=next_hop if next_hop != "0.0.0.0" else None,
+                protocol="BGP",
+                local_preference=int(local_pref),
+                med=int(med),
+                as_path=as_path,
+                vrf=vrf
+            )
+
+            # Determine route type from status
+            if ">" in status:
+                route.route_type = "best"
+            elif "*" in status:
+                route.route_type = "valid"
+            elif "i" in status:
+                route.route_type = "internal"
+
+            append_route(route)
         
         return routes
\ No newline at end of file
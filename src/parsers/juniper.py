@@ -3,6 +3,25 @@ import re
 from typing import List, Optional
 from .base import BaseParser, ParsedRoute, VRFInfo
 
+_RD_RE = re.compile(r'\d+:\d+', re.ASCII)
+_DESTINATION_RE = re.compile(r'^\d+\.\d+\.\d+\.\d+/\d+', re.ASCII)
+
+# Single-pass field scanner for _parse_route_line: one finditer walk
+# collects every field instead of seven separate re.search calls that
+# each rescanned the line from the start. The branch order keeps the
+# combined "to X via Y" form ahead of the bare "via Y" fallback.
+_FIELDS_RE = re.compile(
+    r'\[(?P<proto>[A-Za-z]+)/(?P<ad>\d+)\]'
+    r'|MED (?P<med>\d+)'
+    r'|localpref (?P<lp>\d+)'
+    r'|metric (?P<metric>\d+)'
+    r'|to\s+(?P<nh>\S+)\s+via\s+(?P<iface>\S+)'
+    r'|>\s+to\s+(?P<nh2>\S+)'
+    r'|via\s+(?P<iface2>\S+)'
+    r'|AS path: (?P<aspath>[^,]+)',
+    re.ASCII
+)
+
 
 class JuniperParser(BaseParser):
     """Parser for Juniper JunOS routing tables."""
@@ -25,11 +44,7 @@ class JuniperParser(BaseParser):
         """Parse VRF list output."""
         vrfs = [VRFInfo(name="default")]  # Always include default VRF
         
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
-        for line in lines:
-            line = line.strip()
+        for line in self.iter_lines(output):
             if not line or line.startswith("Instance"):
                 continue
             
@@ -41,7 +56,7 @@ class JuniperParser(BaseParser):
                 
                 # Look for RD in the line
                 for part in parts:
-                    if ":" in part and re.match(r'\d+:\d+', part):
+                    if ":" in part and _RD_RE.match(part):
                         rd = part
                         break
                 
@@ -52,45 +67,50 @@ class JuniperParser(BaseParser):
     def parse_routing_table(self, output: str, vrf: str = "default") -> List[ParsedRoute]:
         """Parse Juniper routing table output."""
         routes = []
-        cleaned_output = self.clean_output(output)
-        lines = cleaned_output.split('\n')
-        
         current_destination = None
-        
-        for line in lines:
-            line = line.strip()
+
+        # Bind hot-loop callables locally; attribute lookups cost per
+        # access in CPython and this loop runs once per output line.
+        append_route = routes.append
+        parse_line = self._parse_route_line
+        match_dest = _DESTINATION_RE.match
+
+        for line in self.iter_lines(output):
             if not line:
                 continue
             
-            # Skip header lines
-            if any(header in line for header in ["Destination", "inet.0:", "inet6.0:"]):
-                continue
-            
+            # Dispatch on the first character: destinations start with a
+            # digit, continuations with '*', '[', '>', 'via' or 'to', so
+            # header lines ("Destination", "inet.0:", ...) never reach a
+            # regex.
+            first = line[0]
+
             # Check if this is a destination line (starts with network)
-            if re.match(r'^\d+\.\d+\.\d+\.\d+/\d+', line):
+            if '0' <= first <= '9' and match_dest(line):
                 # New destination
                 parts = line.split()
                 current_destination = parts[0]
                 
                 # If there's route info on the same line
                 if len(parts) > 1:
-                    route = self._parse_route_line(current_destination, line, vrf)
+                    route = parse_line(current_destination, line, vrf)
                     if route:
-                        routes.append(route)
+                        append_route(route)
             
-            elif line.startswith('*[') or line.startswith('['):
+            elif first == '[' or line.startswith('*['):
                 # Route continuation line
                 if current_destination:
-                    route = self._parse_route_line(current_destination, line, vrf)
+                    route = parse_line(current_destination, line, vrf)
                     if route:
-                        routes.append(route)
-            
-            elif current_destination and (line.startswith('>') or 
-                                        any(line.startswith(p) for p in ['via', 'to'])):
+                        append_route(route)
+
+            elif current_destination and (first == '>' or
+                                          line.startswith('via') or
+                                          line.startswith('to')):
                 # Another route for the same destination
-                route = self._parse_route_line(current_destination, line, vrf)
+                route = parse_line(current_destination, line, vrf)
                 if route:
-                    routes.append(route)
+                    append_route(route)
         
         self.logger.info("Parsed routing table", vrf=vrf, route_count=len(routes))
         return routes
@@ -115,47 +135,33 @@ class JuniperParser(BaseParser):
         med = None
         as_path = None
         
-        # Extract protocol and admin distance
-        protocol_match = re.search(r'\[([A-Za-z]+)/(\d+)\]', line)
-        if protocol_match:
-            protocol = self.normalize_protocol(protocol_match.group(1))
-            admin_distance = int(protocol_match.group(2))
-        
-        # Extract MED
-        med_match = re.search(r'MED (\d+)', line)
-        if med_match:
-            med = int(med_match.group(1))
-        
-        # Extract local preference
-        localpref_match = re.search(r'localpref (\d+)', line)
-        if localpref_match:
-            local_pref = int(localpref_match.group(1))
-        
-        # Extract metric
-        metric_match = re.search(r'metric (\d+)', line)
-        if metric_match:
-            metric = int(metric_match.group(1))
-        
-        # Extract next hop and interface
-        via_match = re.search(r'to\s+(\S+)\s+via\s+(\S+)', line)
-        if via_match:
-            next_hop = via_match.group(1)
-            interface = via_match.group(2)
-        else:
-            # Try alternative format
-            to_match = re.search(r'>\s+to\s+(\S+)', line)
-            if to_match:
-                next_hop = to_match.group(1)
-            
-            via_match = re.search(r'via\s+(\S+)', line)
-            if via_match:
-                interface = via_match.group(1)
-        
-        # Extract AS path for BGP routes
-        if protocol == "BGP":
-            as_path_match = re.search(r'AS path: (.+?)(?:,|$)', line)
-            if as_path_match:
-                as_path = as_path_match.group(1).strip()
+        # Collect every field in one left-to-right scan of the line
+        for field in _FIELDS_RE.finditer(line):
+            kind = field.lastgroup
+            if kind == 'ad':
+                if protocol is None:
+                    protocol = self.normalize_protocol(field.group('proto'))
+                    admin_distance = int(field.group('ad'))
+            elif kind == 'med':
+                med = int(field.group('med'))
+            elif kind == 'lp':
+                local_pref = int(field.group('lp'))
+            elif kind == 'metric':
+                metric = int(field.group('metric'))
+            elif kind == 'iface':
+                next_hop = field.group('nh')
+                interface = field.group('iface')
+            elif kind == 'nh2':
+                next_hop = field.group('nh2')
+            elif kind == 'iface2':
+                if interface is None:
+                    interface = field.group('iface2')
+            elif kind == 'aspath':
+                as_path = field.group('aspath').strip()
+
+        # AS path only applies to BGP routes
+        if protocol != "BGP":
+            as_path = None
         
         route = ParsedRoute(
             destination=dest_ip,
@@ -1,10 +1,14 @@
 """Scheduler for periodic route table collection and change detection."""
-import time
-import schedule
+import ipaddress
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Set, Any
+from typing import Dict, Any
 import structlog
-from sqlalchemy import and_, desc
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.orm import aliased
 
 from .config import config
 from .database import db_manager
@@ -14,180 +18,272 @@ from .collector import RouteTableCollector
 logger = structlog.get_logger(__name__)
 
 
+def _merge_key(row):
+    """Comparable route key matching the server's inet ordering.
+
+    The merge streams are sorted by Route.destination, which Postgres
+    orders as inet (family, then address value) while psycopg2 hands
+    the values back as strings — and string order disagrees with inet
+    order (\"10.0.0.9\" > \"10.0.0.10\" lexically), which would break
+    the merge invariant. Keying on (version, packed bytes) reproduces
+    the server's ordering exactly for host addresses.
+    """
+    ip = ipaddress.ip_address(row[0])
+    return (ip.version, ip.packed, row[1], row[2])
+
+
 class ChangeDetector:
     """Detect changes in routing tables between collection runs."""
-    
+
+    # Completed (device_id, run_id) results kept for duplicate calls.
+    _MEMO_SIZE = 128
+
     def __init__(self):
         self.logger = logger.bind(component="change_detector")
-    
-    def detect_changes(self, device_id: str, current_run_id: str) -> Dict[str, int]:
-        """Detect changes between current and previous collection runs."""
-        with db_manager.get_session() as session:
-            # Get current collection run
-            current_run = session.query(CollectionRun).filter_by(id=current_run_id).first()
-            if not current_run:
-                return {"added": 0, "removed": 0, "modified": 0}
-            
-            # Get previous successful collection run
-            previous_run = session.query(CollectionRun).filter(
-                and_(
-                    CollectionRun.device_id == device_id,
-                    CollectionRun.id != current_run_id,
-                    CollectionRun.status == "completed"
-                )
-            ).order_by(desc(CollectionRun.completed_at)).first()
-            
-            if not previous_run:
-                # No previous run to compare
-                return {"added": current_run.total_routes, "removed": 0, "modified": 0}
-            
-            # Get routes from both runs
-            current_routes = session.query(Route).filter_by(
-                collection_run_id=current_run_id
-            ).all()
-            
-            previous_routes = session.query(Route).filter_by(
-                collection_run_id=previous_run.id
-            ).all()
-            
-            # Create route sets for comparison
-            current_route_set = self._create_route_set(current_routes)
-            previous_route_set = self._create_route_set(previous_routes)
-            
-            # Detect changes
-            added_routes = current_route_set - previous_route_set
-            removed_routes = previous_route_set - current_route_set
-            
-            # Detect modifications (same network but different attributes)
-            current_networks = {self._get_route_key(r): r for r in current_routes}
-            previous_networks = {self._get_route_key(r): r for r in previous_routes}
-            
-            modified_count = 0
-            for network_key in current_networks.keys() & previous_networks.keys():
-                if self._routes_differ(current_networks[network_key], 
-                                     previous_networks[network_key]):
-                    modified_count += 1
-            
-            changes = {
-                "added": len(added_routes),
-                "removed": len(removed_routes),
-                "modified": modified_count
-            }
-            
-            # Update collection run statistics
-            current_run.routes_added = changes["added"]
-            current_run.routes_removed = changes["removed"]
-            current_run.routes_modified = changes["modified"]
-            session.commit()
-            
-            # Log changes if significant
-            total_change_pct = (changes["added"] + changes["removed"] + changes["modified"]) / max(current_run.total_routes, 1) * 100
-            if total_change_pct > config.change_threshold:
-                self._log_changes(session, device_id, current_routes, previous_routes, changes)
-            
-            self.logger.info("Change detection completed", 
-                           device_id=device_id, 
-                           changes=changes,
-                           change_percentage=total_change_pct)
-            
-            return changes
-    
-    def _create_route_set(self, routes: List[Route]) -> Set[str]:
-        """Create a set of route identifiers for comparison."""
-        return {self._get_route_signature(route) for route in routes}
-    
-    def _get_route_key(self, route: Route) -> str:
-        """Get a unique key for a route (network + VRF)."""
-        return f"{route.destination}/{route.prefix_length}:{route.vrf.name}"
-    
-    def _get_route_signature(self, route: Route) -> str:
-        """Get a complete signature for a route including all attributes."""
-        return (f"{route.destination}/{route.prefix_length}:"
-                f"{route.vrf.name}:{route.protocol}:{route.next_hop}:"
-                f"{route.metric}:{route.admin_distance}")
-    
-    def _routes_differ(self, route1: Route, route2: Route) -> bool:
-        """Check if two routes with same network differ in attributes."""
-        return (route1.next_hop != route2.next_hop or
-                route1.protocol != route2.protocol or
-                route1.metric != route2.metric or
-                route1.admin_distance != route2.admin_distance or
-                route1.interface != route2.interface)
-    
-    def _log_changes(self, session, device_id: str, current_routes: List[Route], 
-                    previous_routes: List[Route], changes: Dict[str, int]):
-        """Log detailed changes to the change log table."""
-        device = session.query(Device).filter_by(id=device_id).first()
-        if not device:
-            return
-        
-        # Create detailed change logs
-        current_networks = {self._get_route_key(r): r for r in current_routes}
-        previous_networks = {self._get_route_key(r): r for r in previous_routes}
+        # LRU memo of completed results: a manual trigger overlapping
+        # the scheduled sweep would otherwise redo the full comparison
+        # and rewrite the change logs for the same run.
+        self._memo = OrderedDict()
+        # The scheduler sweep calls detect_changes from worker threads.
+        self._memo_lock = threading.Lock()
+
+    def detect_changes(self, device_id: str, current_run_id: str,
+                       session=None) -> Dict[str, int]:
+        """Detect changes between current and previous collection runs.
+
+        An existing session may be passed in so batch callers (the
+        scheduler's recent-runs sweep) reuse one connection checkout
+        across devices instead of opening a transaction per call.
+        Results are memoized per (device, run), so a duplicate call for
+        an already-processed run returns without touching the database.
+        """
+        memo_key = (device_id, current_run_id)
+        with self._memo_lock:
+            cached = self._memo.get(memo_key)
+            if cached is not None:
+                self._memo.move_to_end(memo_key)
+                return cached
+
+        if session is not None:
+            changes = self._detect_changes(session, device_id, current_run_id)
+        else:
+            with db_manager.get_session() as session:
+                changes = self._detect_changes(session, device_id, current_run_id)
+
+        with self._memo_lock:
+            self._memo[memo_key] = changes
+            if len(self._memo) > self._MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return changes
+
+    def _detect_changes(self, session, device_id: str, current_run_id: str) -> Dict[str, int]:
+        # Get current collection run
+        current_run = session.query(CollectionRun).filter_by(id=current_run_id).first()
+        if not current_run:
+            return {"added": 0, "removed": 0, "modified": 0}
         
-        # Log added routes
-        for network_key in current_networks.keys() - previous_networks.keys():
-            route = current_networks[network_key]
-            change_log = ChangeLog(
-                device_id=device_id,
-                vrf_name=route.vrf.name,
-                change_type="added",
-                route_network=f"{route.destination}/{route.prefix_length}",
-                new_values={
-                    "protocol": route.protocol,
-                    "next_hop": route.next_hop,
-                    "metric": route.metric,
-                    "admin_distance": route.admin_distance,
-                    "interface": route.interface
-                }
+        # Get previous successful collection run
+        previous_run = session.query(CollectionRun).filter(
+            and_(
+                CollectionRun.device_id == device_id,
+                CollectionRun.id != current_run_id,
+                CollectionRun.status == "completed"
             )
-            session.add(change_log)
+        ).order_by(desc(CollectionRun.completed_at)).first()
         
-        # Log removed routes
-        for network_key in previous_networks.keys() - current_networks.keys():
-            route = previous_networks[network_key]
-            change_log = ChangeLog(
-                device_id=device_id,
-                vrf_name=route.vrf.name,
-                change_type="removed",
-                route_network=f"{route.destination}/{route.prefix_length}",
-                old_values={
-                    "protocol": route.protocol,
-                    "next_hop": route.next_hop,
-                    "metric": route.metric,
-                    "admin_distance": route.admin_distance,
-                    "interface": route.interface
-                }
+        if not previous_run:
+            # No previous run to compare; still mark the run processed
+            # so the sweep does not pick it up again.
+            current_run.change_detection_done = True
+            session.commit()
+            return {"added": current_run.total_routes, "removed": 0, "modified": 0}
+        
+        # Compute the counts entirely in SQL instead of pulling
+        # every route row of both runs into Python: added/removed
+        # come from EXCEPT over the signature columns and modified
+        # from a self-join on the route key, so only three scalar
+        # counts cross the wire.
+        sig_cols = (
+            Route.destination, Route.prefix_length, Route.vrf_id,
+            Route.protocol, Route.next_hop, Route.metric,
+            Route.admin_distance,
+        )
+
+        def sig_select(run_id):
+            return select(*sig_cols).where(Route.collection_run_id == run_id)
+
+        def count_of(stmt):
+            return session.execute(
+                select(func.count()).select_from(stmt.subquery())
+            ).scalar()
+
+        added_count = count_of(
+            sig_select(current_run_id).except_(sig_select(previous_run.id))
+        )
+        removed_count = count_of(
+            sig_select(previous_run.id).except_(sig_select(current_run_id))
+        )
+
+        # Modified: same network key in both runs with any compared
+        # attribute differing (IS DISTINCT FROM handles the NULLs).
+        cur = aliased(Route)
+        prev = aliased(Route)
+        modified_count = count_of(
+            select(cur.destination, cur.prefix_length, cur.vrf_id)
+            .distinct()
+            .join(prev, and_(
+                cur.destination == prev.destination,
+                cur.prefix_length == prev.prefix_length,
+                cur.vrf_id == prev.vrf_id,
+            ))
+            .where(
+                cur.collection_run_id == current_run_id,
+                prev.collection_run_id == previous_run.id,
+                or_(
+                    cur.next_hop.is_distinct_from(prev.next_hop),
+                    cur.protocol != prev.protocol,
+                    cur.metric.is_distinct_from(prev.metric),
+                    cur.admin_distance.is_distinct_from(prev.admin_distance),
+                    cur.interface.is_distinct_from(prev.interface),
+                ),
             )
-            session.add(change_log)
+        )
+
+        changes = {
+            "added": added_count,
+            "removed": removed_count,
+            "modified": modified_count
+        }
+
+        # Update collection run statistics
+        current_run.routes_added = changes["added"]
+        current_run.routes_removed = changes["removed"]
+        current_run.routes_modified = changes["modified"]
+        current_run.change_detection_done = True
+        session.commit()
+
+        # Log changes if significant. Even on this rare path the
+        # two runs are never held in memory at once: both are
+        # streamed key-ordered and merge-joined (see _log_changes),
+        # so the working set stays at one server-side fetch block
+        # per run regardless of table size.
+        total_change_pct = (changes["added"] + changes["removed"] + changes["modified"]) / max(current_run.total_routes, 1) * 100
+        if total_change_pct > config.change_threshold:
+            self._log_changes(session, device_id, current_run_id, previous_run.id)
         
-        # Log modified routes
-        for network_key in current_networks.keys() & previous_networks.keys():
-            current_route = current_networks[network_key]
-            previous_route = previous_networks[network_key]
-            
-            if self._routes_differ(current_route, previous_route):
-                change_log = ChangeLog(
-                    device_id=device_id,
-                    vrf_name=current_route.vrf.name,
-                    change_type="modified",
-                    route_network=f"{current_route.destination}/{current_route.prefix_length}",
-                    old_values={
-                        "protocol": previous_route.protocol,
-                        "next_hop": previous_route.next_hop,
-                        "metric": previous_route.metric,
-                        "admin_distance": previous_route.admin_distance,
-                        "interface": previous_route.interface
-                    },
-                    new_values={
-                        "protocol": current_route.protocol,
-                        "next_hop": current_route.next_hop,
-                        "metric": current_route.metric,
-                        "admin_distance": current_route.admin_distance,
-                        "interface": current_route.interface
-                    }
-                )
-                session.add(change_log)
+        self.logger.info("Change detection completed", 
+                       device_id=device_id, 
+                       changes=changes,
+                       change_percentage=total_change_pct)
+        
+        return changes
+
+    # Rows fetched per server-side block and log rows buffered before a
+    # flush; 64k key tuples keep each block's working set within a few
+    # MB so the merge stays cache-resident.
+    _MERGE_BLOCK = 65536
+
+    def _iter_run_rows(self, session, run_id):
+        """Stream a run's route tuples ordered by the route key."""
+        stmt = (
+            select(
+                Route.destination, Route.prefix_length, Route.vrf_id,
+                Route.protocol, Route.next_hop, Route.metric,
+                Route.admin_distance, Route.interface, VRF.name,
+            )
+            .join(VRF, Route.vrf_id == VRF.id)
+            .where(Route.collection_run_id == run_id)
+            .order_by(Route.destination, Route.prefix_length, Route.vrf_id)
+            .execution_options(yield_per=self._MERGE_BLOCK)
+        )
+        return iter(session.execute(stmt))
+
+    def _log_changes(self, session, device_id: str, current_run_id, previous_run_id):
+        """Log detailed changes to the change log table.
+
+        Both runs are streamed key-ordered (yield_per server-side
+        cursors) and merge-joined, so a million-route device costs one
+        fetch block per side instead of two full in-memory dicts.
+        Duplicate keys (ECMP paths) pair up positionally within their
+        key group. Log rows are flushed in blocks with Core
+        executemany; the engine's values_plus_batch mode batches each
+        flush server-side.
+        """
+        device = session.query(Device).filter_by(id=device_id).first()
+        if not device:
+            return
+
+        rows = []
+        add_row = rows.append
+
+        def flush():
+            if rows:
+                session.execute(ChangeLog.__table__.insert(), rows)
+                del rows[:]
+
+        def values_of(row):
+            return {
+                "protocol": row[3],
+                "next_hop": row[4],
+                "metric": row[5],
+                "admin_distance": row[6],
+                "interface": row[7],
+            }
+
+        cur_iter = self._iter_run_rows(session, current_run_id)
+        prev_iter = self._iter_run_rows(session, previous_run_id)
+        cur_row = next(cur_iter, None)
+        prev_row = next(prev_iter, None)
+        # Keys are derived with _merge_key so Python comparisons agree
+        # with the server's inet sort order.
+        cur_key = _merge_key(cur_row) if cur_row is not None else None
+        prev_key = _merge_key(prev_row) if prev_row is not None else None
+
+        while cur_row is not None or prev_row is not None:
+            if prev_key is None or (cur_key is not None and cur_key < prev_key):
+                # Only in the current run: added
+                add_row({
+                    "device_id": device_id,
+                    "vrf_name": cur_row[8],
+                    "change_type": "added",
+                    "route_network": f"{cur_row[0]}/{cur_row[1]}",
+                    "old_values": None,
+                    "new_values": values_of(cur_row),
+                })
+                cur_row = next(cur_iter, None)
+                cur_key = _merge_key(cur_row) if cur_row is not None else None
+            elif cur_key is None or prev_key < cur_key:
+                # Only in the previous run: removed
+                add_row({
+                    "device_id": device_id,
+                    "vrf_name": prev_row[8],
+                    "change_type": "removed",
+                    "route_network": f"{prev_row[0]}/{prev_row[1]}",
+                    "old_values": values_of(prev_row),
+                    "new_values": None,
+                })
+                prev_row = next(prev_iter, None)
+                prev_key = _merge_key(prev_row) if prev_row is not None else None
+            else:
+                # Same key in both runs: modified if any attribute differs
+                if cur_row[3:8] != prev_row[3:8]:
+                    add_row({
+                        "device_id": device_id,
+                        "vrf_name": cur_row[8],
+                        "change_type": "modified",
+                        "route_network": f"{cur_row[0]}/{cur_row[1]}",
+                        "old_values": values_of(prev_row),
+                        "new_values": values_of(cur_row),
+                    })
+                cur_row = next(cur_iter, None)
+                prev_row = next(prev_iter, None)
+                cur_key = _merge_key(cur_row) if cur_row is not None else None
+                prev_key = _merge_key(prev_row) if prev_row is not None else None
+
+            if len(rows) >= self._MERGE_BLOCK:
+                flush()
+
+        flush()
 
 
 class RouteTableScheduler:
@@ -198,19 +294,23 @@ class RouteTableScheduler:
         self.change_detector = ChangeDetector()
         self.logger = logger.bind(component="scheduler")
         self.running = False
-    
+        # Event-driven scheduler: sleeps until the next fire time
+        # instead of waking every minute to poll, and jobs run on its
+        # own worker threads.
+        self.scheduler = BackgroundScheduler()
+        self._stop_event = threading.Event()
+
     def setup_schedule(self):
         """Setup periodic collection schedule."""
-        interval_minutes = config.collection_interval // 60
-        
         # Schedule collection
-        schedule.every(interval_minutes).minutes.do(self.run_collection)
-        
+        self.scheduler.add_job(self.run_collection, "interval",
+                               seconds=config.collection_interval)
+
         # Schedule cleanup (daily at 2 AM)
-        schedule.every().day.at("02:00").do(self.cleanup_old_data)
-        
-        self.logger.info("Schedule configured", 
-                        collection_interval_minutes=interval_minutes)
+        self.scheduler.add_job(self.cleanup_old_data, "cron", hour=2)
+
+        self.logger.info("Schedule configured",
+                        collection_interval_seconds=config.collection_interval)
     
     def run_collection(self):
         """Run a collection cycle."""
@@ -241,22 +341,36 @@ class RouteTableScheduler:
                 and_(
                     CollectionRun.status == "completed",
                     CollectionRun.completed_at >= cutoff_time,
-                    CollectionRun.routes_added == 0,  # Not yet processed
-                    CollectionRun.routes_removed == 0,
-                    CollectionRun.routes_modified == 0
+                    CollectionRun.change_detection_done.is_(False)
                 )
             ).all()
             
-            for run in recent_runs:
+            # Snapshot the ids before leaving the session; the workers
+            # below open their own sessions (Session is not
+            # thread-safe).
+            pending = [(str(run.device_id), str(run.id)) for run in recent_runs]
+
+        if not pending:
+            return
+
+        # Detection per run is dominated by DB roundtrips, so fan the
+        # runs out over a small thread pool sized within db_workers —
+        # the same budget the collector uses for its store fan-out —
+        # and let each worker check out its own pooled connection.
+        with ThreadPoolExecutor(max_workers=min(config.db_workers, len(pending))) as executor:
+            futures = {
+                executor.submit(self.change_detector.detect_changes,
+                                device_id, run_id): (device_id, run_id)
+                for device_id, run_id in pending
+            }
+            for future in as_completed(futures):
+                device_id, run_id = futures[future]
                 try:
-                    self.change_detector.detect_changes(
-                        str(run.device_id), 
-                        str(run.id)
-                    )
+                    future.result()
                 except Exception as e:
-                    self.logger.error("Change detection failed", 
-                                    device_id=str(run.device_id),
-                                    run_id=str(run.id),
+                    self.logger.error("Change detection failed",
+                                    device_id=device_id,
+                                    run_id=run_id,
                                     error=str(e))
     
     def cleanup_old_data(self):
@@ -264,32 +378,29 @@ class RouteTableScheduler:
         try:
             with db_manager.get_session() as session:
                 cutoff_date = datetime.utcnow() - timedelta(days=30)
-                
-                # Delete old collection runs and their routes
-                old_runs = session.query(CollectionRun).filter(
+
+                # Three bulk DELETEs instead of loading each old run
+                # into the ORM and cascading row by row: routes go
+                # first via a run-id subquery, then the runs, then the
+                # change logs. synchronize_session=False skips the
+                # identity-map bookkeeping, and rowcounts replace the
+                # per-run count queries.
+                old_run_ids = select(CollectionRun.id).where(
                     CollectionRun.completed_at < cutoff_date
-                ).all()
-                
-                deleted_runs = 0
-                deleted_routes = 0
-                
-                for run in old_runs:
-                    # Count routes before deletion
-                    route_count = session.query(Route).filter_by(
-                        collection_run_id=run.id
-                    ).count()
-                    
-                    # Delete routes (cascade will handle this)
-                    session.delete(run)
-                    
-                    deleted_runs += 1
-                    deleted_routes += route_count
-                
+                )
+                deleted_routes = session.query(Route).filter(
+                    Route.collection_run_id.in_(old_run_ids)
+                ).delete(synchronize_session=False)
+
+                deleted_runs = session.query(CollectionRun).filter(
+                    CollectionRun.completed_at < cutoff_date
+                ).delete(synchronize_session=False)
+
                 # Delete old change logs
                 old_changes = session.query(ChangeLog).filter(
                     ChangeLog.detected_at < cutoff_date
-                ).delete()
-                
+                ).delete(synchronize_session=False)
+
                 session.commit()
                 
                 self.logger.info("Cleanup completed", 
@@ -304,27 +415,32 @@ class RouteTableScheduler:
         """Run the scheduler."""
         self.logger.info("Starting route table scheduler")
         self.running = True
-        
+        self._stop_event.clear()
+
         # Setup schedule
         self.setup_schedule()
-        
+
         # Run initial collection
         self.run_collection()
-        
-        # Start scheduler loop
-        while self.running:
-            try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-            except KeyboardInterrupt:
-                self.logger.info("Scheduler stopped by user")
-                break
-            except Exception as e:
-                self.logger.error("Scheduler error", error=str(e))
-                time.sleep(60)
-        
+
+        # Jobs fire on the background scheduler's threads; this thread
+        # just blocks until stop() (no periodic wakeups). Device SSH
+        # connections stay open between cycles (see
+        # RouteTableCollector.close_connections), so only close them
+        # once the scheduler shuts down.
+        self.scheduler.start()
+        try:
+            self._stop_event.wait()
+        except KeyboardInterrupt:
+            self.logger.info("Scheduler stopped by user")
+        finally:
+            self.running = False
+            self.scheduler.shutdown(wait=False)
+            self.collector.close_connections()
+
         self.logger.info("Route table scheduler stopped")
-    
+
     def stop(self):
         """Stop the scheduler."""
-        self.running = False
\ No newline at end of file
+        self.running = False
+        self._stop_event.set()
\ No newline at end of file